@@ -1,10 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import datetime as dt
+import gzip
+import json
+import logging
+import os
 import sys
 import pathlib
 import platform
-from functools import lru_cache
-from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache, partial
+from typing import Any, AsyncIterator, Dict, Iterable, List, Literal, Optional, Sequence, Tuple
 
 # Work around macOS python_implementation parsing bug before importing pandas
 try:
@@ -17,10 +30,17 @@ except ValueError:
     platform._sys_version = _patched_sys_version  # type: ignore[attr-defined]
 
 import numpy as np
+import orjson
 import pandas as pd
-from fastapi import FastAPI, HTTPException
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, validator
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, field_validator
 
 # Ensure we can import the existing backtesting engine and locate data assets
 BACKEND_ROOT = pathlib.Path(__file__).resolve().parent
@@ -29,24 +49,114 @@ for path in (PROJECT_ROOT, BACKEND_ROOT):
     if str(path) not in sys.path:
         sys.path.append(str(path))
 
-import backtest_system  # type: ignore
+from backend import backtest_system
 from backend.engine import (
     FeeModel,
     TradeBuilderConfig,
-    build_equity_curve,
+    build_curves_and_metrics,
     build_trades_from_picks,
-    compute_drawdown,
-    compute_performance_metrics,
     warn_if_returns_constant,
 )
-from backend.reports.serializer import serialise_trades
+from backend.reports.serializer import format_dates, serialise_trades
+
+logger = logging.getLogger(__name__)
 
 DATA_DIR = PROJECT_ROOT / "data"
 MIN_BACKTEST_DATE = pd.Timestamp("2020-01-01")
 MAX_LOOKBACK_YEARS = 5
+# Metadata columns the API reads (``symbol`` is the pre-migration ticker name).
+METADATA_COLUMNS = ("ticker", "symbol", "sector", "market_cap")
+# Response compression settings, shared by ``GZipMiddleware`` and ``_encode_response``.
+GZIP_MINIMUM_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 5
+
+
+# Wide tables mapped by each backtest worker (populated by ``_init_backtest_worker``).
+_WORKER_TABLES: Dict[str, pa.Table] = {}
+
+
+@lru_cache(maxsize=1)
+def _backtest_executor() -> ProcessPoolExecutor:
+    """Return the process pool used for the CPU-bound indicator pass.
+
+    The pool is created on first use so importing the module stays cheap.
+    ``BACKTEST_WORKERS`` overrides the worker count (defaults to the CPU count).
+    Workers memory-map the shared wide tables once at start-up, so tasks only
+    carry the date window, config and ticker list.
+    """
+
+    workers = int(os.getenv("BACKTEST_WORKERS", "0") or 0) or os.cpu_count() or 1
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_backtest_worker,
+        initargs=(_shared_table_paths(),),
+    )
+
+
+@lru_cache(maxsize=1)
+def _shared_table_paths() -> Dict[str, str]:
+    """Write the wide tables once as uncompressed Arrow IPC files.
+
+    The files live in ``/dev/shm`` when available so every worker maps the
+    same pages instead of decompressing or unpickling its own copy.
+    """
+
+    tables = _read_wide_feathers()
+    shm = pathlib.Path("/dev/shm")
+    root = tempfile.mkdtemp(prefix="backtest-tables-", dir=str(shm) if shm.is_dir() else None)
+    atexit.register(shutil.rmtree, root, True)
+    paths: Dict[str, str] = {}
+    for name, table in tables.items():
+        path = os.path.join(root, f"{name}.arrow")
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        paths[name] = path
+    return paths
+
+
+def _map_tables(paths: Dict[str, str]) -> Dict[str, pa.Table]:
+    return {name: pa.ipc.open_file(pa.memory_map(path, "r")).read_all() for name, path in paths.items()}
+
+
+def _init_backtest_worker(paths: Dict[str, str]) -> None:
+    _WORKER_TABLES.clear()
+    _wide_arrays.cache_clear()
+    _WORKER_TABLES.update(_map_tables(paths))
+
+
+def _run_backtest_task(
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    config: Dict[str, Any],
+    max_horizon: int,
+    hist_horizon: int,
+    allowed_symbols: List[str],
+) -> Dict[str, Any]:
+    """Slice the worker's mapped tables and run the indicator pass."""
+
+    tables = _filter_tables_by_date(_wide_arrays(), start, end)
+    return backtest_system.run_backtest_for_all(
+        tables["adj"],
+        tables["high"],
+        tables["low"],
+        tables["close"],
+        tables.get("volume"),
+        config=config,
+        max_horizon=max_horizon,
+        hist_horizon=hist_horizon,
+        allowed_symbols=allowed_symbols,
+    )
+
+
+_ISO_DATE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
 
 
 def _parse_date(value: str) -> pd.Timestamp:
+    # Request dates are almost always plain ``YYYY-MM-DD`` strings; those take
+    # a cached fast path. Anything else (compact or relative forms such as
+    # ``20230105`` or ``today``) goes to pandas uncached, as before.
+    if isinstance(value, str) and _ISO_DATE.fullmatch(value):
+        return _parse_iso_date(value)
     try:
         ts = pd.to_datetime(value)
     except ValueError as exc:  # pragma: no cover - defensive parsing
@@ -56,6 +166,14 @@ def _parse_date(value: str) -> pd.Timestamp:
     return ts.normalize()
 
 
+@lru_cache(maxsize=1024)
+def _parse_iso_date(value: str) -> pd.Timestamp:
+    try:
+        return pd.Timestamp(dt.date.fromisoformat(value)).as_unit("ns")
+    except ValueError as exc:  # impossible day or outside the ns range
+        raise HTTPException(status_code=400, detail=f"Invalid date: {value}") from exc
+
+
 def _enforce_date_window(start: str, end: str) -> Tuple[pd.Timestamp, pd.Timestamp]:
     start_ts = _parse_date(start)
     end_ts = _parse_date(end)
@@ -78,7 +196,32 @@ def _enforce_date_window(start: str, end: str) -> Tuple[pd.Timestamp, pd.Timesta
 
     return start_ts, end_ts
 
-app = FastAPI(title="Backtesting Adapter API")
+def _json_default(value: Any) -> Any:
+    if isinstance(value, pd.Timestamp):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class NumpyORJSONResponse(ORJSONResponse):
+    """``ORJSONResponse`` that also accepts NumPy scalars and pandas timestamps."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_json_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    _warm_data_caches()
+    yield
+
+
+app = FastAPI(title="Backtesting Adapter API", default_response_class=NumpyORJSONResponse, lifespan=_lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -86,6 +229,7 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
 
 
 class RSIRule(BaseModel):
@@ -99,7 +243,8 @@ class Filters(BaseModel):
     mcap_max: Optional[float] = Field(default=None, ge=0)
     exclude_tickers: Optional[List[str]] = None
 
-    @validator("exclude_tickers")
+    @field_validator("exclude_tickers")
+    @classmethod
     def _normalise(cls, v: Optional[List[str]]) -> Optional[List[str]]:
         if v is None:
             return v
@@ -184,18 +329,42 @@ class BacktestResponse(BaseModel):
     total_fees: float
 
 
+@lru_cache(maxsize=1)
 def _load_metadata() -> Optional[pd.DataFrame]:
     meta_path = DATA_DIR / "sp500_metadata.feather"
     if meta_path.exists():
-        df = pd.read_feather(meta_path)
-        df = df.rename(columns={"symbol": "ticker"})
+        schema = pa.ipc.open_file(pa.memory_map(str(meta_path), "r")).schema
+        columns = [name for name in schema.names if name in METADATA_COLUMNS]
+        table = feather.read_table(str(meta_path), columns=columns, memory_map=True)
+        if "symbol" in table.column_names:
+            # Bundles predating ``migrate_data.py`` still use the old name.
+            logger.warning("sp500_metadata.feather uses a 'symbol' column; run migrate_data.py")
+            table = table.rename_columns(["ticker" if c == "symbol" else c for c in table.column_names])
+        df = table.to_pandas()
+        # Dictionary-encode the repeated string columns so universe filters
+        # compare integer codes rather than Python strings.
+        for col in ("ticker", "sector"):
+            if col in df.columns:
+                df[col] = df[col].astype("category")
         return df
     return None
 
 
 @lru_cache(maxsize=1)
-def _load_wide_tables() -> Dict[str, pd.DataFrame]:
-    tables: Dict[str, pd.DataFrame] = {}
+def _load_wide_tables() -> Dict[str, pa.Table]:
+    """Return the wide price tables as memory-mapped Arrow tables.
+
+    The tables map the same uncompressed IPC files as the backtest workers
+    (see ``_shared_table_paths``), so the server holds no private decoded
+    copy.  Workers turn them into ``_WideArrays`` once and slice each
+    request's date window out of those (see ``_filter_tables_by_date``).
+    """
+
+    return _map_tables(_shared_table_paths())
+
+
+def _read_wide_feathers() -> Dict[str, pa.Table]:
+    tables: Dict[str, pa.Table] = {}
     required = {
         "adj": DATA_DIR / "adjclose_wide.feather",
         "high": DATA_DIR / "high_wide.feather",
@@ -209,69 +378,183 @@ def _load_wide_tables() -> Dict[str, pd.DataFrame]:
             "Missing wide tables in data directory: " + ", ".join(missing)
         )
     for key, path in required.items():
-        df = pd.read_feather(path)
-        df["date"] = pd.to_datetime(df["date"])  # ensure datetime
-        tables[key] = df
+        tables[key] = _ensure_timestamp_dates(feather.read_table(str(path), memory_map=True))
     return tables
 
 
+def _ensure_timestamp_dates(table: pa.Table) -> pa.Table:
+    """Return ``table`` with its ``date`` column typed as ``timestamp[ns]``.
+
+    Bundles written by ``data_pipeline`` already store timestamps, in which
+    case this is a schema check only.  Older string-typed bundles are parsed
+    with an explicit ISO format instead of per-value inference.
+    """
+
+    date_idx = table.schema.get_field_index("date")
+    if date_idx < 0:
+        return table
+    column = table.column(date_idx)
+    if column.type == pa.timestamp("ns"):
+        return table
+    if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+        column = pc.strptime(column, format="%Y-%m-%d", unit="ns")
+    else:
+        column = pc.cast(column, pa.timestamp("ns"))
+    return table.set_column(date_idx, "date", column)
+
+
+@dataclass(frozen=True)
+class _WideArrays:
+    """One wide table as sorted ``dates``, ``tickers`` and a (dates x tickers) value matrix."""
+
+    dates: np.ndarray
+    tickers: pd.Index
+    values: np.ndarray
+
+    @classmethod
+    def from_table(cls, table: pa.Table) -> "_WideArrays":
+        if "date" not in table.column_names:
+            raise ValueError("Wide tables must include a 'date' column.")
+        dates = table.column("date").to_numpy()
+        tickers = [name for name in table.column_names if name != "date"]
+        # Column-major storage matches pandas' block layout, so date windows
+        # become DataFrames without copying the values.
+        values = np.empty((len(dates), len(tickers)), dtype=np.float64, order="F")
+        for pos, name in enumerate(tickers):
+            values[:, pos] = table.column(name).to_numpy()
+        if len(dates) > 1 and not (dates[1:] >= dates[:-1]).all():
+            order = np.argsort(dates, kind="stable")
+            dates, values = dates[order], np.asfortranarray(values[order])
+        return cls(dates=dates, tickers=pd.Index(tickers), values=values)
+
+    def window(self, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        lo = int(np.searchsorted(self.dates, start.to_datetime64(), side="left"))
+        hi = int(np.searchsorted(self.dates, end.to_datetime64(), side="right"))
+        frame = pd.DataFrame(self.values[lo:hi], columns=self.tickers, copy=False)
+        frame.insert(0, "date", self.dates[lo:hi])
+        return frame
+
+
+@lru_cache(maxsize=1)
+def _wide_arrays() -> Dict[str, _WideArrays]:
+    """Convert the wide tables (worker-mapped, or loaded locally) to arrays once."""
+
+    tables = _WORKER_TABLES or _load_wide_tables()
+    return {name: _WideArrays.from_table(table) for name, table in tables.items()}
+
+
 def _filter_tables_by_date(
-    tables: Dict[str, pd.DataFrame],
+    tables: Dict[str, _WideArrays],
     start: pd.Timestamp,
     end: pd.Timestamp,
 ) -> Dict[str, pd.DataFrame]:
-    filtered: Dict[str, pd.DataFrame] = {}
-    for name, table in tables.items():
-        if "date" not in table.columns:
-            filtered[name] = table
-            continue
-        frame = table.copy()
-        frame["date"] = pd.to_datetime(frame["date"])
-        mask = (frame["date"] >= start) & (frame["date"] <= end)
-        filtered[name] = frame.loc[mask].reset_index(drop=True)
-    return filtered
+    return {name: arrays.window(start, end) for name, arrays in tables.items()}
 
 
-def _build_universe(filters: Optional[Filters], explicit: Optional[List[str]]) -> pd.DataFrame:
+
+@lru_cache(maxsize=1)
+def _universe_index() -> Dict[str, Any]:
+    """Precompute lookup structures used by ``_build_universe``.
+
+    The metadata is static per process, so sector membership, a market-cap
+    ordering and a ticker index are built once and every request filters by
+    intersecting integer positions before taking a single copy of the frame.
+    """
+
     metadata = _load_metadata()
     if metadata is None:
         # fall back to using symbol list from wide table
-        tickers = [col for col in _load_wide_tables()["adj"].columns if col != "date"]
-        df = pd.DataFrame({"ticker": tickers})
-    else:
-        df = metadata.copy()
+        tickers = [col for col in _load_wide_tables()["adj"].column_names if col != "date"]
+        metadata = pd.DataFrame({"ticker": tickers})
+
+    ticker_idx = pd.Index(metadata["ticker"].to_numpy())
+    lookup: Dict[str, Any] = {
+        "df": metadata,
+        "ticker_idx": ticker_idx,
+        "unique_tickers": ticker_idx.is_unique,
+        "sector_groups": None,
+        "mcap_order": None,
+        "mcap_sorted": None,
+    }
+    if "sector" in metadata.columns:
+        lookup["sector_groups"] = metadata.groupby("sector", observed=True).indices
+    if "market_cap" in metadata.columns:
+        caps = metadata["market_cap"].to_numpy(dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(caps))
+        order = valid[np.argsort(caps[valid], kind="stable")]
+        lookup["mcap_order"] = order
+        lookup["mcap_sorted"] = caps[order]
+    return lookup
+
+
+def _build_universe(filters: Optional[Filters], explicit: Optional[List[str]]) -> pd.DataFrame:
+    lookup = _universe_index()
+    df: pd.DataFrame = lookup["df"]
+    ticker_idx: pd.Index = lookup["ticker_idx"]
+    positions = np.arange(len(df))
 
     if filters:
-        if filters.sectors and "sector" in df.columns:
-            df = df[df["sector"].isin(filters.sectors)]
-        if filters.mcap_min is not None and "market_cap" in df.columns:
-            df = df[df["market_cap"] >= filters.mcap_min]
-        if filters.mcap_max is not None and "market_cap" in df.columns:
-            df = df[df["market_cap"] <= filters.mcap_max]
+        sector_groups = lookup["sector_groups"]
+        if filters.sectors and sector_groups is not None:
+            selected = [sector_groups[sector] for sector in filters.sectors if sector in sector_groups]
+            members = np.concatenate(selected) if selected else np.empty(0, dtype=positions.dtype)
+            positions = np.intersect1d(positions, members)
+        mcap_order = lookup["mcap_order"]
+        if filters.mcap_min is not None and mcap_order is not None:
+            lo = np.searchsorted(lookup["mcap_sorted"], filters.mcap_min, side="left")
+            positions = np.intersect1d(positions, mcap_order[lo:])
+        if filters.mcap_max is not None and mcap_order is not None:
+            hi = np.searchsorted(lookup["mcap_sorted"], filters.mcap_max, side="right")
+            positions = np.intersect1d(positions, mcap_order[:hi])
         if filters.exclude_tickers:
-            df = df[~df["ticker"].isin(filters.exclude_tickers)]
+            excluded = ticker_idx.get_indexer_for(filters.exclude_tickers)
+            positions = np.setdiff1d(positions, excluded[excluded >= 0])
 
     if explicit:
-        df = df[df["ticker"].isin([ticker.upper() for ticker in explicit])]
+        wanted = ticker_idx.get_indexer_for([ticker.upper() for ticker in explicit])
+        positions = np.intersect1d(positions, wanted[wanted >= 0])
 
-    if df.empty:
+    if positions.size == 0:
         raise HTTPException(status_code=400, detail="Universe filter removed all tickers.")
 
-    return df.drop_duplicates(subset="ticker")
+    universe = df.take(positions)
+    if lookup["unique_tickers"]:
+        return universe
+    return universe.drop_duplicates(subset="ticker")
+
+
+def _request_config(payload: BacktestParams) -> Dict[str, Any]:
+    """Return the backtester config for the request's indicator settings.
+
+    ``_map_indicators`` and ``_build_config`` are pure, so the pair is
+    memoised on a canonical JSON form of the raw indicators and RSI rule;
+    repeated parameter sweeps from the UI skip both.
+    """
+
+    rsi_rule = payload.rsi_rule.model_dump() if payload.rsi_rule else None
+    key = json.dumps([payload.indicators, rsi_rule], sort_keys=True, default=str)
+    return dict(_request_config_cached(key))
+
+
+@lru_cache(maxsize=256)
+def _request_config_cached(key: str) -> Tuple[Tuple[str, Any], ...]:
+    indicators, rsi_rule = json.loads(key)
+    rule = RSIRule.model_construct(**rsi_rule) if rsi_rule is not None else None
+    return tuple(_build_config(_map_indicators(indicators, rule)).items())
 
 
-def _map_indicators(payload: BacktestParams) -> Dict[str, Any]:
-    indicators = dict(payload.indicators)
+def _map_indicators(indicators: Dict[str, Any], rsi_rule: Optional[RSIRule]) -> Dict[str, Any]:
+    indicators = dict(indicators)
     rsi_cfg = dict(indicators.get("rsi", {}))
-    if payload.rsi_rule:
+    if rsi_rule:
         rsi_cfg.setdefault("use", True)
         rsi_cfg.setdefault("n", rsi_cfg.get("n", 14))
-        if payload.rsi_rule.mode == "oversold":
+        if rsi_rule.mode == "oversold":
             rsi_cfg["rule"] = "oversold"
-            rsi_cfg["oversold"] = payload.rsi_rule.threshold
+            rsi_cfg["oversold"] = rsi_rule.threshold
         else:
             rsi_cfg["rule"] = "overbought"
-            rsi_cfg["overbought"] = payload.rsi_rule.threshold
+            rsi_cfg["overbought"] = rsi_rule.threshold
     if rsi_cfg:
         indicators["rsi"] = rsi_cfg
     else:
@@ -280,6 +563,8 @@ def _map_indicators(payload: BacktestParams) -> Dict[str, Any]:
 
 
 def _build_config(indicators: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate request indicators into a backtester config."""
+
     cfg: Dict[str, Any] = {
         "use_rsi": False,
         "rsi_n": 14,
@@ -364,10 +649,119 @@ def _build_config(indicators: Dict[str, Any]) -> Dict[str, Any]:
     return cfg
 
 
+def _distribution_stats(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Mean, median, population std, skew and excess kurtosis along axis 0.
+
+    NaNs are skipped per column.  Skew and kurtosis use the bias-corrected
+    estimators with pandas' small-sample and float-error rules, so results
+    match ``Series.skew``/``Series.kurt`` without building a Series per column.
+    """
+
+    missing = np.isnan(values)
+    count = (~missing).sum(axis=0).astype(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(missing, 0.0, values).sum(axis=0) / count
+        dev = np.where(missing, 0.0, values - mean)
+        dev2 = dev * dev
+        m2 = dev2.sum(axis=0)
+        std = np.sqrt(m2 / count)
+        m2 = np.where(np.abs(m2) < 1e-14, 0.0, m2)
+        m3 = (dev2 * dev).sum(axis=0)
+        m3 = np.where(np.abs(m3) < 1e-14, 0.0, m3)
+        m4 = (dev2 * dev2).sum(axis=0)
+
+        skew = (count * (count - 1) ** 0.5 / (count - 2)) * (m3 / m2**1.5)
+        skew = np.where(count < 3, np.nan, np.where(m2 == 0, 0.0, skew))
+
+        numerator = count * (count + 1) * (count - 1) * m4
+        numerator = np.where(np.abs(numerator) < 1e-14, 0.0, numerator)
+        denominator = (count - 2) * (count - 3) * m2**2
+        denominator = np.where(np.abs(denominator) < 1e-14, 0.0, denominator)
+        kurt = numerator / denominator - 3 * (count - 1) ** 2 / ((count - 2) * (count - 3))
+        kurt = np.where(count < 4, np.nan, np.where(denominator == 0, 0.0, kurt))
+    median = np.nanmedian(values, axis=0) if values.size else np.full(values.shape[1:], np.nan)
+    return {"mean": mean, "median": median, "std": std, "skew": skew, "kurt": kurt}
+
+
+def _to_time_series(series: pd.Series, dates: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Serialise a date-indexed Series, optionally reusing pre-formatted dates.
+
+    ``values`` stays a float64 ndarray; the response class encodes it natively.
+    """
+
+    if series is None or series.empty:
+        return {"dates": [], "values": []}
+    return {
+        "dates": dates if dates is not None else format_dates(series.index),
+        "values": np.round(series.to_numpy(dtype=np.float64), 6),
+    }
+
+
+def _mean_by_date(dates: Any, values: Any) -> pd.Series:
+    """Average ``values`` per distinct date, skipping NaNs like ``groupby().mean()``."""
+
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    values = np.asarray(values, dtype=np.float64)
+    dated = ~np.isnat(dates)
+    dates, values = dates[dated], values[dated]
+    if dates.size == 0:
+        return pd.Series(dtype=np.float64)
+    if (dates[1:] < dates[:-1]).any():
+        order = np.argsort(dates, kind="stable")
+        dates, values = dates[order], values[order]
+
+    starts = np.concatenate(([0], np.flatnonzero(dates[1:] != dates[:-1]) + 1))
+    observed = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(observed, values, 0.0), starts)
+    counts = np.add.reduceat(observed.astype(np.int64), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    return pd.Series(means, index=pd.DatetimeIndex(dates[starts]))
+
+
+def _build_signals(ledger: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert execution ledger events into chart signal payloads (see ``Signal``).
+
+    Columns are pulled out as arrays once and zipped into plain dicts; the
+    ledger is generated internally and already carries the right types.
+    """
+
+    if ledger is None or ledger.empty:
+        return []
+    ledger = ledger.sort_values("ts")
+    dates = format_dates(ledger["ts"])
+    prices = ledger["price"].to_numpy(dtype=np.float64).tolist()
+    symbols = ledger["symbol"].tolist()
+    is_buy = ledger["event"].to_numpy() == "buy"
+    quantities = ledger["quantity"].to_numpy(dtype=np.float64)
+    sides = np.where(is_buy, "buy", "sell").tolist()
+    sizes = np.where(is_buy, quantities, -quantities).tolist()
+    return [
+        {"date": date, "type": side, "price": price, "symbol": symbol, "size": size}
+        for date, price, symbol, side, size in zip(dates, prices, symbols, sides, sizes)
+    ]
+
+
+def _build_trades(realised_trades: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Convert realised trades into payloads (see ``Trade``) ordered by entry."""
 
+    items = serialise_trades(realised_trades)
+    if not items:
+        return items
+    # Entry day, then symbol (missing symbols first); lexsort is stable like list.sort.
+    enter_days = pd.DatetimeIndex(realised_trades["enter_date"]).normalize().asi8
+    symbols = np.asarray(realised_trades["symbol"].fillna("").to_numpy(), dtype=str)
+    return [items[i] for i in np.lexsort((symbols, enter_days))]
 
 
+def _warm_data_caches() -> None:
+    """Load the data bundle once at startup so the first request is not cold."""
 
+    try:
+        _load_wide_tables()
+    except FileNotFoundError as exc:
+        logger.warning("Skipping wide-table warm-up: %s", exc)
+    _universe_meta_cached()
 
 
 @app.get("/healthz")
@@ -377,6 +771,13 @@ def healthz() -> Dict[str, str]:
 
 @app.get("/universe/meta")
 def universe_meta() -> Dict[str, Any]:
+    return _universe_meta_cached()
+
+
+@lru_cache(maxsize=1)
+def _universe_meta_cached() -> Dict[str, Any]:
+    """Build the sector and market-cap filter options once per process."""
+
     metadata = _load_metadata()
     if metadata is not None and "sector" in metadata.columns:
         sectors = sorted(metadata["sector"].dropna().unique().tolist())
@@ -403,20 +804,51 @@ def universe_meta() -> Dict[str, Any]:
     return {"sectors": sectors, "mcap_buckets": mcap_buckets}
 
 
-@app.post("/run_backtest", response_model=BacktestResponse)
-def run_backtest(payload: BacktestParams) -> BacktestResponse:
+def _empty_backtest_response(universe_size: int, initial_capital: float) -> Dict[str, Any]:
+    return {
+        "equity_curve": {"dates": [], "values": []},
+        "drawdown_curve": {"dates": [], "values": []},
+        "price_series": None,
+        "signals": [],
+        "trades": [],
+        "metrics": {},
+        "histogram": None,
+        "indicator_statistics": {},
+        "universe_size": universe_size,
+        "trades_count": 0,
+        "initial_capital": initial_capital,
+        "ending_equity": initial_capital,
+        "total_return": 0.0,
+        "total_fees": 0.0,
+    }
+
+
+@dataclass(frozen=True)
+class _BacktestPlan:
+    """Validated, clamped request parameters shared by the ``run_backtest`` stages."""
+
+    start: pd.Timestamp
+    end: pd.Timestamp
+    tickers: List[str]
+    config: Dict[str, Any]
+    max_horizon: int
+    hist_horizon: int
+    hist_bins: int
+    hold_days: int
+
+
+def _plan_backtest(payload: BacktestParams) -> _BacktestPlan:
     start_ts, end_ts = _enforce_date_window(payload.start, payload.end)
     universe_df = _build_universe(payload.filters, payload.universe)
     tickers = universe_df["ticker"].tolist()
 
-    tables = _filter_tables_by_date(_load_wide_tables(), start_ts, end_ts)
-    if tables["adj"].empty:
+    adj_dates = _load_wide_tables()["adj"].column("date").to_numpy()
+    if not ((adj_dates >= start_ts.to_datetime64()) & (adj_dates <= end_ts.to_datetime64())).any():
         raise HTTPException(
             status_code=400,
             detail="No price data found for the selected date range."
         )
-    indicators = _map_indicators(payload)
-    config = _build_config(indicators)
+    config = _request_config(payload)
     max_horizon = payload.indicators.get("max_horizon", 10)
     hist_horizon = payload.indicators.get("hist_horizon", 1)
     hist_bins = payload.hist_bins or 20
@@ -429,29 +861,31 @@ def run_backtest(payload: BacktestParams) -> BacktestResponse:
         hist_horizon = 1
     if hist_bins < 5:
         hist_bins = 5
-
-    result = backtest_system.run_backtest_for_all(
-        tables["adj"],
-        tables["high"],
-        tables["low"],
-        tables["close"],
-        tables.get("volume"),
+    return _BacktestPlan(
+        start=start_ts,
+        end=end_ts,
+        tickers=tickers,
         config=config,
         max_horizon=max_horizon,
         hist_horizon=hist_horizon,
-        allowed_symbols=tickers,
+        hist_bins=hist_bins,
+        hold_days=hold_days,
     )
 
+
+def _backtest_payload(payload: BacktestParams, plan: _BacktestPlan, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Build trades, curves and statistics from the indicator pass ``result``."""
+
     picks = result.get("picks", pd.DataFrame())
     if not picks.empty:
-        picks = picks.copy()
-        if not np.issubdtype(picks["date"].dtype, np.datetime64):
-            picks["date"] = pd.to_datetime(picks["date"])
-        picks = picks[(picks["date"] >= start_ts) & (picks["date"] <= end_ts)]
+        picks = picks[(picks["date"] >= plan.start) & (picks["date"] <= plan.end)]
     initial_capital = float(payload.capital or 1.0)
+    if picks.empty:
+        # Nothing fired: skip the trade builder, curves and stats entirely.
+        return _empty_backtest_response(len(plan.tickers), initial_capital)
     fee_model = FeeModel(payload.fee_bps or 0.0)
     trade_config = TradeBuilderConfig(
-        hold_days=hold_days,
+        hold_days=plan.hold_days,
         fee_model=fee_model,
         initial_capital=initial_capital,
         stop_loss_pct=payload.stop_loss_pct or payload.indicators.get("stop_loss_pct"),
@@ -462,117 +896,124 @@ def run_backtest(payload: BacktestParams) -> BacktestResponse:
     realised_trades = execution_result.trades
     warn_if_returns_constant(realised_trades)
 
-    ledger = execution_result.ledger
-    signals: List[Signal] = []
-    if not ledger.empty:
-        ledger = ledger.sort_values("ts")
-        for record in ledger.itertuples():
-            ts = pd.to_datetime(record.ts)
-            date_str = ts.strftime("%Y-%m-%d")
-            side = "buy" if record.event == "buy" else "sell"
-            size = float(record.quantity if side == "buy" else -record.quantity)
-            signals.append(
-                Signal(
-                    date=date_str,
-                    price=float(record.price),
-                    symbol=record.symbol,
-                    type=side,
-                    size=size,
-                )
-            )
-
-    trades_payload = serialise_trades(realised_trades)
-    trades = [Trade(**item) for item in trades_payload]
-    trades.sort(key=lambda t: (t.enter_date, t.symbol or ""))
-
-    equity = build_equity_curve(realised_trades, initial_capital=initial_capital, column="net_pnl")
-    drawdown = compute_drawdown(equity)
-
-    equity_ts = (
-        TimeSeries(dates=[d.strftime("%Y-%m-%d") for d in equity.index], values=equity.round(6).tolist())
-        if not equity.empty
-        else TimeSeries(dates=[], values=[])
-    )
-    drawdown_ts = (
-        TimeSeries(dates=[d.strftime("%Y-%m-%d") for d in drawdown.index], values=drawdown.round(6).tolist())
-        if not drawdown.empty
-        else TimeSeries(dates=[], values=[])
+    signals = _build_signals(execution_result.ledger)
+
+    trades = _build_trades(realised_trades)
+
+    equity, drawdown, metrics = build_curves_and_metrics(
+        realised_trades, initial_capital=initial_capital, column="net_pnl"
     )
 
-    metrics = compute_performance_metrics(equity, drawdown)
+    # The drawdown shares the equity index, so its dates are formatted once.
+    curve_dates = format_dates(equity.index)
+    equity_ts = _to_time_series(equity, curve_dates)
+    drawdown_ts = _to_time_series(drawdown, curve_dates)
+
     ending_equity = metrics.get("ending_equity", initial_capital)
     total_return = float(ending_equity / initial_capital - 1.0) if initial_capital else 0.0
     total_fees = float(realised_trades["fees"].sum()) if not realised_trades.empty else 0.0
     stats_df = result.get("statistics", pd.DataFrame())
     hist_df = result.get("hist_data", pd.DataFrame())
 
-    price_ts: Optional[TimeSeries] = None
+    price_ts: Optional[Dict[str, Any]] = None
     if not picks.empty:
-        price_series = picks.groupby("date")["adj_close"].mean().sort_index()
-        price_ts = TimeSeries(
-            dates=[d.strftime("%Y-%m-%d") for d in price_series.index],
-            values=price_series.round(6).tolist(),
-        )
-
-    histogram_payload: Optional[HistogramPayload] = None
-    hist_col = f"fwd_ret_{hist_horizon}d"
-    sample = hist_df[hist_col] if hist_col in hist_df.columns else pd.Series(dtype=float)
-    sample_clean = sample.dropna()
-    if not sample_clean.empty:
-        simple_sample = np.expm1(sample_clean)
-        counts, bin_edges = np.histogram(simple_sample, bins=hist_bins)
+        price_series = _mean_by_date(picks["date"], picks["adj_close"])
+        price_ts = _to_time_series(price_series)
+
+    histogram_payload: Optional[Dict[str, Any]] = None
+    hist_col = f"fwd_ret_{plan.hist_horizon}d"
+    sample = hist_df[hist_col].to_numpy(dtype=np.float64) if hist_col in hist_df.columns else np.empty(0)
+    simple_sample = np.expm1(sample[~np.isnan(sample)])
+    if simple_sample.size:
+        counts, bin_edges = np.histogram(simple_sample, bins=plan.hist_bins)
+        edges = bin_edges.tolist()
         buckets = [
-            HistogramBucket(
-                bin_start=float(bin_edges[i]),
-                bin_end=float(bin_edges[i + 1]),
-                count=int(counts[i]),
-            )
-            for i in range(len(counts))
+            {"bin_start": start, "bin_end": end, "count": count}
+            for start, end, count in zip(edges[:-1], edges[1:], counts.tolist())
         ]
-        simple_series = pd.Series(simple_sample)
-        stats_for_hist = {
-            "mean": float(simple_series.mean()),
-            "median": float(simple_series.median()),
-            "std": float(simple_series.std(ddof=0)),
-            "skew": float(simple_series.skew()),
-            "kurt": float(simple_series.kurt()),
+        stats_for_hist = {name: float(value) for name, value in _distribution_stats(simple_sample).items()}
+        histogram_payload = {
+            "horizon": plan.hist_horizon,
+            "buckets": buckets,
+            "stats": stats_for_hist,
+            "sample_size": int(simple_sample.size),
+            "bin_count": int(plan.hist_bins),
         }
-        histogram_payload = HistogramPayload(
-            horizon=hist_horizon,
-            buckets=buckets,
-            stats=stats_for_hist,
-            sample_size=int(simple_series.shape[0]),
-            bin_count=int(hist_bins),
-        )
 
     indicator_stats: Dict[str, Dict[str, float]] = {}
-    if not picks.empty:
-        for col in [c for c in picks.columns if c.startswith("fwd_ret_")]:
-            series = picks[col].dropna()
-            if series.empty:
-                continue
-            simple_series = np.expm1(series)
-            indicator_stats[col] = {
-                "mean": float(simple_series.mean()),
-                "median": float(simple_series.median()),
-                "std": float(simple_series.std(ddof=0)),
-                "skew": float(simple_series.skew()),
-                "kurt": float(simple_series.kurt()),
-            }
-
-    return BacktestResponse(
-        equity_curve=equity_ts,
-        drawdown_curve=drawdown_ts,
-        price_series=price_ts,
-        signals=signals,
-        trades=trades,
-        metrics=metrics,
-        histogram=histogram_payload,
-        indicator_statistics=indicator_stats,
-        universe_size=len(tickers),
-        trades_count=len(trades),
-        initial_capital=initial_capital,
-        ending_equity=ending_equity,
-        total_return=total_return,
-        total_fees=total_fees,
+    ret_cols = [c for c in picks.columns if c.startswith("fwd_ret_")]
+    if ret_cols:
+        # One NaN-skipping reduction per statistic across every horizon column.
+        simple = np.expm1(picks[ret_cols].to_numpy(dtype=np.float64))
+        observed = (~np.isnan(simple)).any(axis=0)
+        stats = _distribution_stats(simple[:, observed])
+        names = list(stats)
+        rows = np.column_stack([stats[name] for name in names]).tolist()
+        indicator_stats = {
+            col: dict(zip(names, values))
+            for col, values in zip([c for c, keep in zip(ret_cols, observed) if keep], rows)
+        }
+
+    return {
+        "equity_curve": equity_ts,
+        "drawdown_curve": drawdown_ts,
+        "price_series": price_ts,
+        "signals": signals,
+        "trades": trades,
+        "metrics": metrics,
+        "histogram": histogram_payload,
+        "indicator_statistics": indicator_stats,
+        "universe_size": len(plan.tickers),
+        "trades_count": len(trades),
+        "initial_capital": initial_capital,
+        "ending_equity": ending_equity,
+        "total_return": total_return,
+        "total_fees": total_fees,
+    }
+
+
+def _encode_response(content: Dict[str, Any], accepts_gzip: bool) -> NumpyORJSONResponse:
+    """Render and, when the client accepts it, gzip ``content``.
+
+    ``GZipMiddleware`` passes through responses that already carry a
+    ``Content-Encoding``, so bodies compressed here are not compressed again
+    on the event loop.
+    """
+
+    response = NumpyORJSONResponse(content)
+    if accepts_gzip and len(response.body) >= GZIP_MINIMUM_SIZE:
+        response.body = gzip.compress(response.body, compresslevel=GZIP_COMPRESS_LEVEL)
+        response.headers["Content-Encoding"] = "gzip"
+        response.headers["Content-Length"] = str(len(response.body))
+        response.headers.add_vary_header("Accept-Encoding")
+    return response
+
+
+def _backtest_response(
+    payload: BacktestParams, plan: _BacktestPlan, result: Dict[str, Any], accepts_gzip: bool
+) -> NumpyORJSONResponse:
+    return _encode_response(_backtest_payload(payload, plan, result), accepts_gzip)
+
+
+# ``BacktestResponse`` documents the payload in the OpenAPI schema only; the
+# handler returns plain dicts so FastAPI skips response validation/encoding.
+@app.post("/run_backtest", response_model=None, responses={200: {"model": BacktestResponse}})
+async def run_backtest(payload: BacktestParams, request: Request) -> NumpyORJSONResponse:
+    # The coroutine only awaits: validation, trade building and rendering run
+    # in Starlette's threadpool and the indicator pass in the process pool, so
+    # other requests (``/healthz`` included) are not queued behind this one.
+    plan = await run_in_threadpool(_plan_backtest, payload)
+    result = await asyncio.get_running_loop().run_in_executor(
+        _backtest_executor(),
+        partial(
+            _run_backtest_task,
+            plan.start,
+            plan.end,
+            plan.config,
+            plan.max_horizon,
+            plan.hist_horizon,
+            plan.tickers,
+        ),
     )
+    accepts_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+    return await run_in_threadpool(_backtest_response, payload, plan, result, accepts_gzip)
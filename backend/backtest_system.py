@@ -18,7 +18,8 @@ requirements:
 * **Use publicly available daily OHLCV data**.  The function
   ``fetch_daily_data_alpha_vantage`` demonstrates how to call the Alpha Vantage
   API.  You can supply your own API key and call this function for each
-  ticker you wish to back‑test.  Replace this function or add additional
+  ticker you wish to back‑test, or use ``fetch_many_alpha_vantage`` to fetch
+  several tickers concurrently.  Replace these functions or add additional
   functions if you prefer a different provider.
 
 * **Compute a variety of technical indicators** – RSI, ADX, Aroon, stochastic
@@ -78,11 +79,15 @@ from __future__ import annotations
 
 import math
 import datetime as dt
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from dataclasses import dataclass, fields
-from typing import List, Tuple, Optional, Dict, Sequence, Mapping, Any
+from typing import Iterator, List, Tuple, Optional, Dict, Sequence, Mapping, Any
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 import matplotlib.pyplot as plt
 
 try:
@@ -90,6 +95,11 @@ try:
 except ImportError:
     requests = None  # type: ignore
 
+try:  # Optional numba support, shared with the engine; compiles the recursive kernels
+    from backend.engine._njit import NUMBA_AVAILABLE, njit
+except ImportError:  # imported as a top-level module from inside ``backend/``
+    from engine._njit import NUMBA_AVAILABLE, njit  # type: ignore
+
 
 @dataclass
 class IndicatorConfig:
@@ -162,27 +172,43 @@ class IndicatorConfig:
         return names
 
 
-def get_sp500_tickers() -> List[str]:
-    """Return a hard‑coded list of S&P 500 tickers.
+# Recent S&P 500 component symbols as of early 2025, built once at import.
+_SP500_TICKERS: Tuple[str, ...] = (
+    "AAPL", "MSFT", "AMZN", "NVDA", "META", "GOOGL", "GOOG", "BRK.B", "JPM", "JNJ",
+    "V", "UNH", "XOM", "MA", "PG", "TSLA", "LLY", "HD", "MRK", "ABBV",
+    "COST", "CVX", "ADBE", "AVGO", "KO", "PEP", "PFE", "BAC", "MCD", "CSCO",
+    "ORCL", "DHR", "NKE", "DIS", "BMY", "WMT", "CRM", "ACN", "ABT", "TXN",
+    "NFLX", "INTC", "CMCSA", "QCOM", "AMD", "TMUS", "NEE", "LOW", "VZ", "T",
+    "LIN", "PM", "CAT", "HON", "AMGN", "GE", "UPS", "SBUX", "IBM", "RTX",
+    "INTU", "SPGI", "BLK", "AXP", "LMT", "MDT", "SYK", "ISRG", "NOW", "BKNG",
+    "CB", "BA", "PLD", "DE", "GILD", "AMAT", "PYPL", "ADI", "ELV",
+    "C", "SCHW", "GS", "COP", "CL", "SO", "MO", "TJX", "TGT", "CI",
+    "MMC", "USB", "APD", "CVS", "DUK", "CME", "HUM", "ADP", "CSX", "PGR",
+    # ... list truncated for brevity; add the remaining tickers as needed
+)
+
+
+def get_sp500_tickers() -> Tuple[str, ...]:
+    """Return a hard‑coded tuple of S&P 500 tickers.
 
     Networking is disabled in this environment, so we cannot scrape the list
-    from the internet.  Instead we embed a recent list of S&P 500 component
+    from the internet.  Instead we embed a recent list of S&P 500 component
     symbols as of early 2025.  You can update this list manually if the
-    composition of the index changes.
+    composition of the index changes.  The same immutable tuple is returned
+    on every call; wrap it in ``list()`` if you need to modify it.
     """
-    return [
-        "AAPL", "MSFT", "AMZN", "NVDA", "META", "GOOGL", "GOOG", "BRK.B", "JPM", "JNJ",
-        "V", "UNH", "XOM", "MA", "PG", "TSLA", "LLY", "HD", "MRK", "ABBV",
-        "COST", "CVX", "ADBE", "AVGO", "KO", "PEP", "PFE", "BAC", "MCD", "CSCO",
-        "ORCL", "DHR", "NKE", "DIS", "BMY", "WMT", "CRM", "ACN", "ABT", "TXN",
-        "NFLX", "INTC", "CMCSA", "QCOM", "AMD", "TMUS", "NEE", "LOW", "VZ", "T",
-        "LIN", "PM", "CAT", "HON", "AMGN", "GE", "UPS", "SBUX", "IBM", "RTX",
-        "INTU", "SPGI", "BLK", "AXP", "LMT", "MDT", "SYK", "ISRG", "NOW", "BKNG",
-        "CB", "BA", "PLD", "AMD", "DE", "GILD", "AMAT", "PYPL", "ADI", "ELV",
-        "C", "SCHW", "GS", "COP", "CL", "SO", "MO", "TJX", "TGT", "CI",
-        "MMC", "USB", "APD", "CVS", "DUK", "CME", "HUM", "ADP", "CSX", "PGR"
-        # ... list truncated for brevity; add the remaining tickers as needed
-    ]
+    return _SP500_TICKERS
+
+
+# Alpha Vantage daily-adjusted field names and the columns they map to.
+_ALPHA_VANTAGE_COLUMNS = {
+    "1. open": "open",
+    "2. high": "high",
+    "3. low": "low",
+    "4. close": "close",
+    "5. adjusted close": "adj_close",
+    "6. volume": "volume",
+}
 
 
 def fetch_daily_data_alpha_vantage(
@@ -211,7 +237,8 @@ def fetch_daily_data_alpha_vantage(
     Returns
     -------
     DataFrame with columns ``date``, ``open``, ``high``, ``low``, ``close``,
-    ``adj_close`` and ``volume`` sorted by ascending date.
+    ``adj_close`` and ``volume`` sorted by ascending date; ``date`` holds
+    ``datetime64`` values.
 
     Notes
     -----
@@ -236,28 +263,157 @@ def fetch_daily_data_alpha_vantage(
     ts_key = "Time Series (Daily)"
     if ts_key not in data:
         raise ValueError(f"Unexpected response from Alpha Vantage: {data}")
-    records = []
-    for date_str, values in data[ts_key].items():
-        record_date = dt.datetime.strptime(date_str, "%Y-%m-%d").date()
-        if start_date and record_date < dt.date.fromisoformat(start_date):
-            continue
-        if end_date and record_date > dt.date.fromisoformat(end_date):
-            continue
-        records.append({
-            "date": record_date,
-            "open": float(values["1. open"]),
-            "high": float(values["2. high"]),
-            "low": float(values["3. low"]),
-            "close": float(values["4. close"]),
-            "adj_close": float(values["5. adjusted close"]),
-            "volume": int(values["6. volume"]),
-        })
-    df = pd.DataFrame(records)
+    df = pd.DataFrame.from_dict(data[ts_key], orient="index")
+    df = df.rename(columns=_ALPHA_VANTAGE_COLUMNS)[list(_ALPHA_VANTAGE_COLUMNS.values())]
+    df = df.astype({col: "float64" for col in df.columns if col != "volume"})
+    df["volume"] = df["volume"].astype("int64")
+    dates = pd.to_datetime(df.index, format="%Y-%m-%d")
+    keep = np.ones(len(df), dtype=bool)
+    if start_date:
+        keep &= dates >= pd.Timestamp(start_date)
+    if end_date:
+        keep &= dates <= pd.Timestamp(end_date)
+    df = df[keep]
+    df.insert(0, "date", dates[keep])
     df.sort_values("date", inplace=True)
     df.reset_index(drop=True, inplace=True)
     return df
 
 
+def fetch_many_alpha_vantage(
+    symbols: Sequence[str],
+    api_key: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    output_size: str = "full",
+    max_workers: int = 5,
+) -> Dict[str, pd.DataFrame]:
+    """Fetch several symbols from Alpha Vantage concurrently.
+
+    Each symbol is fetched with :func:`fetch_daily_data_alpha_vantage` on a
+    thread pool, so the HTTP round trips overlap instead of running one after
+    another.  Keep ``max_workers`` within your API key's rate limit.  Returns a
+    mapping from symbol to its price frame in the order of ``symbols``; the
+    first failed request raises.
+    """
+    symbols = list(symbols)
+
+    def _fetch(sym: str) -> pd.DataFrame:
+        return fetch_daily_data_alpha_vantage(sym, api_key, start_date, end_date, output_size)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return dict(zip(symbols, executor.map(_fetch, symbols)))
+
+
+def _shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Shift a float array forward by ``periods``, filling the gap with NaN."""
+    out = np.full(values.shape, np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Full-window rolling sum; NaN until ``window`` values and wherever one is NaN.
+
+    Each window is summed on its own over a strided view, so long series do
+    not accumulate drift and an all-zero window sums to exactly zero.
+    """
+    out = np.full(len(values), np.nan)
+    if 0 < window <= len(values):
+        out[window - 1:] = sliding_window_view(values, window).sum(axis=1)
+    return out
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_sum(values, window) / window
+
+
+def _rolling_extreme(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """Full-window rolling ``np.min``/``np.max``; NaN-tainted windows stay NaN."""
+    out = np.full(len(values), np.nan)
+    if 0 < window <= len(values):
+        out[window - 1:] = reducer(sliding_window_view(values, window), axis=1)
+    return out
+
+
+def _ewm_mean_loop(values: np.ndarray, alpha: float) -> np.ndarray:
+    """Step-for-step port of pandas' ``ewm(adjust=False).mean()`` recursion.
+
+    NaNs carry the previous average forward while its weight keeps decaying,
+    exactly as pandas does with ``ignore_na=False``.
+    """
+    out = np.empty(values.size)
+    if values.size == 0:
+        return out
+    weighted = values[0]
+    old_wt = 1.0
+    out[0] = weighted
+    for i in range(1, values.size):
+        cur = values[i]
+        if weighted == weighted:
+            old_wt *= 1.0 - alpha
+            if cur == cur:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif cur == cur:
+            weighted = cur
+        out[i] = weighted
+    return out
+
+
+# Compiled eagerly for the one signature it is called with, so the cost is
+# paid (or loaded from the on-disk cache) at import rather than mid-request.
+_ewm_mean_kernel = (
+    njit("float64[:](float64[:], float64)", cache=True)(_ewm_mean_loop)
+    if NUMBA_AVAILABLE
+    else None
+)
+
+
+def _ewm_mean(values: np.ndarray, span: int) -> np.ndarray:
+    """Recursive (``adjust=False``) exponential moving average of an array."""
+    if _ewm_mean_kernel is None:
+        return pd.Series(values, copy=False).ewm(span=span, adjust=False).mean().to_numpy()
+    if span < 1:
+        raise ValueError("span must satisfy: span >= 1")
+    # Same smoothing factor pandas derives from ``span``.
+    alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+    return _ewm_mean_kernel(np.ascontiguousarray(values, dtype=np.float64), alpha)
+
+
+def _rsi_arrays(
+    prices: np.ndarray,
+    n: int,
+    oversold: float,
+    overbought: float,
+    rule: str,
+) -> Tuple[np.ndarray, np.ndarray]:
+    oversold = max(0.0, min(100.0, oversold))
+    overbought = max(0.0, min(100.0, overbought))
+    deltas = np.diff(prices, prepend=np.nan)
+    gains = np.maximum(deltas, 0.0)
+    losses = -np.minimum(deltas, 0.0)
+    # Use exponential moving average for smoothness
+    avg_gain = _ewm_mean(gains, n)
+    avg_loss = _ewm_mean(losses, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        rsi = 100.0 - (100.0 / (1.0 + rs))
+    # Generate signal based on rule
+    if rule == "signal":
+        # crossover: from below oversold to above oversold
+        signal = (_shift(rsi) < oversold) & (rsi >= oversold)
+    elif rule == "oversold":
+        signal = rsi < oversold
+    elif rule == "overbought":
+        signal = rsi > overbought
+    else:
+        raise ValueError(f"Invalid rule: {rule}")
+    return rsi, signal
+
+
 def calculate_rsi(
     prices: Sequence[float],
     n: int = 14,
@@ -290,31 +446,41 @@ def calculate_rsi(
     signal : Series of bool
         True where the chosen rule triggers a buy signal, otherwise False.
     """
-    oversold = max(0.0, min(100.0, oversold))
-    overbought = max(0.0, min(100.0, overbought))
-    prices = pd.Series(prices).astype(float)
-    deltas = prices.diff()
-    gains = deltas.clip(lower=0)
-    losses = -deltas.clip(upper=0)
-    # Use exponential moving average for smoothness
-    avg_gain = gains.ewm(span=n, adjust=False).mean()
-    avg_loss = losses.ewm(span=n, adjust=False).mean()
-    rs = avg_gain / avg_loss
-    rsi = 100.0 - (100.0 / (1.0 + rs))
-    # Generate signal based on rule
-    signal = pd.Series(False, index=rsi.index)
-    if rule == "signal":
-        # crossover: from below oversold to above oversold
-        below = rsi.shift(1) < oversold
-        above = rsi >= oversold
-        signal = below & above
-    elif rule == "oversold":
-        signal = rsi < oversold
-    elif rule == "overbought":
-        signal = rsi > overbought
-    else:
-        raise ValueError(f"Invalid rule: {rule}")
-    return rsi, signal
+    prices = pd.Series(prices).astype(float, copy=False)
+    rsi, signal = _rsi_arrays(prices.to_numpy(), n, oversold, overbought, rule)
+    return (
+        pd.Series(rsi, index=prices.index, name=prices.name),
+        pd.Series(signal, index=prices.index, name=prices.name),
+    )
+
+
+def _adx_arrays(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    n: int,
+    min_adx: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    plus_dm = np.diff(high, prepend=np.nan)
+    minus_dm = np.diff(low, prepend=np.nan)
+    plus_dm = np.where((plus_dm > minus_dm) & (plus_dm > 0), plus_dm, 0.0)
+    minus_dm = np.where((minus_dm > plus_dm) & (minus_dm > 0), minus_dm, 0.0)
+
+    prev_close = _shift(close)
+    tr1 = high - low
+    tr2 = np.abs(high - prev_close)
+    tr3 = np.abs(low - prev_close)
+    # fmax skips NaN like a row-wise DataFrame max, so the first bar keeps tr1.
+    tr = np.fmax(np.fmax(tr1, tr2), tr3)
+
+    atr = _rolling_mean(tr, n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100.0 * (_rolling_sum(plus_dm, n) / atr)
+        minus_di = 100.0 * (_rolling_sum(minus_dm, n) / atr)
+        dx = (np.abs(plus_di - minus_di) / (plus_di + minus_di)) * 100.0
+    adx = _rolling_mean(dx, n)
+    signal = adx >= min_adx
+    return adx, signal
 
 
 def calculate_adx(
@@ -332,27 +498,37 @@ def calculate_adx(
     Returns the ADX and a boolean signal array indicating where the ADX is
     above the threshold.
     """
-    high = pd.Series(high).astype(float)
-    low = pd.Series(low).astype(float)
-    close = pd.Series(close).astype(float)
-
-    plus_dm = high.diff()
-    minus_dm = low.diff()
-    plus_dm = np.where((plus_dm > minus_dm) & (plus_dm > 0), plus_dm, 0.0)
-    minus_dm = np.where((minus_dm > plus_dm) & (minus_dm > 0), minus_dm, 0.0)
-
-    tr1 = high - low
-    tr2 = abs(high - close.shift(1))
-    tr3 = abs(low - close.shift(1))
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-
-    atr = tr.rolling(window=n, min_periods=n).mean()
-    plus_di = 100.0 * (pd.Series(plus_dm).rolling(window=n, min_periods=n).sum() / atr)
-    minus_di = 100.0 * (pd.Series(minus_dm).rolling(window=n, min_periods=n).sum() / atr)
-    dx = (abs(plus_di - minus_di) / (plus_di + minus_di)) * 100.0
-    adx = dx.rolling(window=n, min_periods=n).mean()
-    signal = adx >= min_adx
-    return adx, signal
+    high = pd.Series(high).astype(float, copy=False)
+    low = pd.Series(low).astype(float, copy=False)
+    close = pd.Series(close).astype(float, copy=False)
+    adx, signal = _adx_arrays(high.to_numpy(), low.to_numpy(), close.to_numpy(), n, min_adx)
+    return pd.Series(adx, index=high.index), pd.Series(signal, index=high.index)
+
+
+def _aroon_arrays(
+    high: np.ndarray,
+    low: np.ndarray,
+    n: int,
+    up_ge: float,
+    dn_le: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    aroon_up = np.full(len(high), np.nan)
+    aroon_down = np.full(len(low), np.nan)
+    if len(high) >= n:
+        # NaNs never win the window, matching the skipna behaviour of
+        # idxmax/idxmin; ties resolve to the earliest bar as before.
+        h = np.where(np.isnan(high), -np.inf, high)
+        l = np.where(np.isnan(low), np.inf, low)
+        hh_dist = (n - 1) - sliding_window_view(h, n).argmax(axis=1)
+        ll_dist = (n - 1) - sliding_window_view(l, n).argmin(axis=1)
+        aroon_up[n - 1:] = 100.0 * (n - hh_dist) / n
+        aroon_down[n - 1:] = 100.0 * (n - ll_dist) / n
+        # A window with no prices at all has no extreme; leave it NaN rather
+        # than reading the -inf/inf fill as a fresh high or low.
+        aroon_up[n - 1:][~sliding_window_view(~np.isnan(high), n).any(axis=1)] = np.nan
+        aroon_down[n - 1:][~sliding_window_view(~np.isnan(low), n).any(axis=1)] = np.nan
+    signal = (aroon_up >= up_ge) & (aroon_down <= dn_le)
+    return aroon_up, aroon_down, signal
 
 
 def calculate_aroon(
@@ -373,24 +549,37 @@ def calculate_aroon(
     Returns a DataFrame with columns ``aroon_up`` and ``aroon_down``, and a
     boolean signal series.
     """
-    high = pd.Series(high).astype(float)
-    low = pd.Series(low).astype(float)
-    aroon_up = pd.Series(index=high.index, dtype=float)
-    aroon_down = pd.Series(index=high.index, dtype=float)
-    for i in range(len(high)):
-        if i < n - 1:
-            aroon_up.iloc[i] = np.nan
-            aroon_down.iloc[i] = np.nan
-        else:
-            hh_idx = high.iloc[i - n + 1:i + 1].idxmax()
-            ll_idx = low.iloc[i - n + 1:i + 1].idxmin()
-            hh_dist = i - high.index.get_loc(hh_idx)
-            ll_dist = i - low.index.get_loc(ll_idx)
-            aroon_up.iloc[i] = 100.0 * (n - hh_dist) / n
-            aroon_down.iloc[i] = 100.0 * (n - ll_dist) / n
-    aroon_df = pd.DataFrame({"aroon_up": aroon_up, "aroon_down": aroon_down})
-    signal = (aroon_df["aroon_up"] >= up_ge) & (aroon_df["aroon_down"] <= dn_le)
-    return aroon_df, signal
+    high = pd.Series(high).astype(float, copy=False)
+    low = pd.Series(low).astype(float, copy=False)
+    aroon_up, aroon_down, signal = _aroon_arrays(high.to_numpy(), low.to_numpy(), n, up_ge, dn_le)
+    aroon_df = pd.DataFrame({"aroon_up": aroon_up, "aroon_down": aroon_down}, index=high.index)
+    return aroon_df, pd.Series(signal, index=high.index)
+
+
+def _stochastic_arrays(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    k_n: int,
+    d_n: int,
+    signal_rule: str,
+    threshold: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    lowest_low = _rolling_extreme(low, k_n, np.min)
+    highest_high = _rolling_extreme(high, k_n, np.max)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percent_k = 100.0 * (close - lowest_low) / (highest_high - lowest_low)
+    percent_d = _rolling_mean(percent_k, d_n)
+    thresh_upper = 100 - threshold
+    if signal_rule == "signal":
+        signal = (_shift(percent_k) < threshold) & (percent_k >= threshold)
+    elif signal_rule == "oversold":
+        signal = percent_k < threshold
+    elif signal_rule == "overbought":
+        signal = percent_k > thresh_upper
+    else:
+        raise ValueError(f"Invalid signal_rule: {signal_rule}")
+    return percent_k, percent_d, signal
 
 
 def calculate_stochastic(
@@ -409,26 +598,31 @@ def calculate_stochastic(
     %%K > 100 - threshold).  ``threshold`` is often set around 20 for
     oversold/overbought conditions.
     """
-    high = pd.Series(high).astype(float)
-    low = pd.Series(low).astype(float)
-    close = pd.Series(close).astype(float)
-    lowest_low = low.rolling(window=k_n, min_periods=k_n).min()
-    highest_high = high.rolling(window=k_n, min_periods=k_n).max()
-    percent_k = 100.0 * (close - lowest_low) / (highest_high - lowest_low)
-    percent_d = percent_k.rolling(window=d_n, min_periods=d_n).mean()
-    result = pd.DataFrame({"%K": percent_k, "%D": percent_d})
-    signal = pd.Series(False, index=percent_k.index)
-    thresh_upper = 100 - threshold
-    if signal_rule == "signal":
-        cross = (percent_k.shift(1) < threshold) & (percent_k >= threshold)
-        signal = cross
-    elif signal_rule == "oversold":
-        signal = percent_k < threshold
-    elif signal_rule == "overbought":
-        signal = percent_k > thresh_upper
+    high = pd.Series(high).astype(float, copy=False)
+    low = pd.Series(low).astype(float, copy=False)
+    close = pd.Series(close).astype(float, copy=False)
+    percent_k, percent_d, signal = _stochastic_arrays(
+        high.to_numpy(), low.to_numpy(), close.to_numpy(), k_n, d_n, signal_rule, threshold
+    )
+    result = pd.DataFrame({"%K": percent_k, "%D": percent_d}, index=close.index)
+    return result, pd.Series(signal, index=close.index)
+
+
+def _macd_arrays(
+    ema_fast: np.ndarray,
+    ema_slow: np.ndarray,
+    signal_n: int,
+    rule: str,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    macd = ema_fast - ema_slow
+    signal_line = _ewm_mean(macd, signal_n)
+    if rule == "signal":
+        signal = (_shift(macd) < _shift(signal_line)) & (macd >= signal_line)
+    elif rule == "positive":
+        signal = macd > 0
     else:
-        raise ValueError(f"Invalid signal_rule: {signal_rule}")
-    return result, signal
+        raise ValueError(f"Invalid rule for MACD: {rule}")
+    return macd, signal_line, signal
 
 
 def calculate_macd(
@@ -443,21 +637,31 @@ def calculate_macd(
     ``rule`` can be ``signal`` (buy when MACD crosses above the signal line), or
     ``positive`` (buy when MACD > 0).
     """
-    prices = pd.Series(prices).astype(float)
-    ema_fast = prices.ewm(span=fast_n, adjust=False).mean()
-    ema_slow = prices.ewm(span=slow_n, adjust=False).mean()
-    macd = ema_fast - ema_slow
-    signal_line = macd.ewm(span=signal_n, adjust=False).mean()
-    df = pd.DataFrame({"macd": macd, "signal": signal_line})
-    signal = pd.Series(False, index=df.index)
-    if rule == "signal":
-        cross = (macd.shift(1) < signal_line.shift(1)) & (macd >= signal_line)
-        signal = cross
+    prices = pd.Series(prices).astype(float, copy=False)
+    values = prices.to_numpy()
+    macd, signal_line, signal = _macd_arrays(
+        _ewm_mean(values, fast_n), _ewm_mean(values, slow_n), signal_n, rule
+    )
+    df = pd.DataFrame({"macd": macd, "signal": signal_line}, index=prices.index)
+    return df, pd.Series(signal, index=prices.index, name=prices.name)
+
+
+def _obv_arrays(prices: np.ndarray, volume: np.ndarray, rule: str) -> Tuple[np.ndarray, np.ndarray]:
+    # Signed volume per bar; flat or missing price moves contribute nothing.
+    steps = np.zeros(len(prices))
+    if len(prices):
+        diff = prices[1:] - prices[:-1]
+        steps[0] = volume[0]
+        steps[1:] = np.where(diff > 0, volume[1:], np.where(diff < 0, -volume[1:], 0.0))
+    obv = np.cumsum(steps)
+    if rule == "rise":
+        ma = _rolling_mean(obv, 20)
+        signal = (_shift(obv) < _shift(ma)) & (obv >= ma)
     elif rule == "positive":
-        signal = macd > 0
+        signal = obv > 0
     else:
-        raise ValueError(f"Invalid rule for MACD: {rule}")
-    return df, signal
+        raise ValueError(f"Invalid rule for OBV: {rule}")
+    return obv, signal
 
 
 def calculate_obv(
@@ -470,27 +674,18 @@ def calculate_obv(
     ``rule`` can be ``rise`` (buy when OBV crosses above its own moving average),
     or ``positive`` (buy when OBV > 0).
     """
-    prices = pd.Series(prices).astype(float)
-    volume = pd.Series(volume).astype(float)
-    obv = pd.Series(index=prices.index, dtype=float)
-    obv.iloc[0] = volume.iloc[0]
-    for i in range(1, len(prices)):
-        if prices.iloc[i] > prices.iloc[i - 1]:
-            obv.iloc[i] = obv.iloc[i - 1] + volume.iloc[i]
-        elif prices.iloc[i] < prices.iloc[i - 1]:
-            obv.iloc[i] = obv.iloc[i - 1] - volume.iloc[i]
-        else:
-            obv.iloc[i] = obv.iloc[i - 1]
-    signal = pd.Series(False, index=obv.index)
-    if rule == "rise":
-        ma = obv.rolling(window=20, min_periods=20).mean()
-        cross = (obv.shift(1) < ma.shift(1)) & (obv >= ma)
-        signal = cross
-    elif rule == "positive":
-        signal = obv > 0
-    else:
-        raise ValueError(f"Invalid rule for OBV: {rule}")
-    return obv, signal
+    prices = pd.Series(prices).astype(float, copy=False)
+    volume = pd.Series(volume).astype(float, copy=False)
+    obv, signal = _obv_arrays(prices.to_numpy(), volume.to_numpy(), rule)
+    return pd.Series(obv, index=prices.index), pd.Series(signal, index=prices.index)
+
+
+def _ema_cross_arrays(
+    ema_short: np.ndarray,
+    ema_long: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    cross = (_shift(ema_short) < _shift(ema_long)) & (ema_short >= ema_long)
+    return ema_short, ema_long, cross
 
 
 def calculate_ema_cross(
@@ -503,12 +698,44 @@ def calculate_ema_cross(
     A buy signal is produced when the shorter moving average crosses above the
     longer moving average (golden cross).
     """
-    prices = pd.Series(prices).astype(float)
-    ema_short = prices.ewm(span=short_n, adjust=False).mean()
-    ema_long = prices.ewm(span=long_n, adjust=False).mean()
-    cross = (ema_short.shift(1) < ema_long.shift(1)) & (ema_short >= ema_long)
-    df = pd.DataFrame({"ema_short": ema_short, "ema_long": ema_long})
-    return df, cross
+    prices = pd.Series(prices).astype(float, copy=False)
+    values = prices.to_numpy()
+    ema_short, ema_long, cross = _ema_cross_arrays(
+        _ewm_mean(values, short_n), _ewm_mean(values, long_n)
+    )
+    df = pd.DataFrame({"ema_short": ema_short, "ema_long": ema_long}, index=prices.index)
+    return df, pd.Series(cross, index=prices.index, name=prices.name)
+
+
+# Number of set bits in every possible byte.
+_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+
+
+def _pack_signals(signals: np.ndarray) -> np.ndarray:
+    """Pack a ``(T, n_signals)`` bool matrix into bytes, signal ``i`` at bit ``i``."""
+    return np.packbits(signals, axis=1, bitorder="little")
+
+
+def _combine_packed_signals(packed: np.ndarray, n_signals: int, policy: str, k: int) -> np.ndarray:
+    """Reduce packed signal bytes to one bool per row under ``policy``."""
+    if policy == "any":
+        return packed.any(axis=1)
+    if policy == "all":
+        full = _pack_signals(np.ones((1, n_signals), dtype=bool))
+        return (packed == full).all(axis=1)
+    if policy == "atleast_k":
+        return _POPCOUNT[packed].sum(axis=1) >= k
+    raise ValueError(f"Invalid policy: {policy}")
+
+
+@lru_cache(maxsize=None)
+def _signal_labels(names: Tuple[str, ...]) -> np.ndarray:
+    """``triggered_signals`` text for every bit pattern over ``names``."""
+    labels = [
+        ", ".join(name for bit, name in enumerate(names) if code >> bit & 1)
+        for code in range(1 << len(names))
+    ]
+    return np.array(labels, dtype=object)
 
 
 def combine_signals(signals: Sequence[pd.Series], policy: str = "any", k: int = 1) -> pd.Series:
@@ -536,6 +763,11 @@ def combine_signals(signals: Sequence[pd.Series], policy: str = "any", k: int =
     """
     if not signals:
         raise ValueError("No signals provided")
+    index = signals[0].index
+    if all(s.dtype == bool and s.index.equals(index) for s in signals):
+        # Already aligned boolean signals reduce directly on the stacked array.
+        packed = _pack_signals(np.column_stack([s.to_numpy() for s in signals]))
+        return pd.Series(_combine_packed_signals(packed, len(signals), policy, k), index=index)
     # Align all signals
     aligned = pd.concat(signals, axis=1)
     if policy == "any":
@@ -555,35 +787,154 @@ def compute_forward_returns(prices: Sequence[float], max_horizon: int = 10) -> p
     Returns
     -------
     DataFrame with columns ``fwd_ret_1d``, ``fwd_ret_2d``, ..., sorted by index
-    aligned with the input prices.  The first ``h`` rows of column
-    ``fwd_ret_hd`` will be NaN because there is no forward data yet.
+    aligned with the input prices.  The last ``h`` rows of column
+    ``fwd_ret_hd`` will be NaN because there is no forward data yet, and so
+    are the first ``h - 1`` rows, which historically fell outside the
+    trailing window the returns were summed over.
     """
-    prices = pd.Series(prices).astype(float)
-    returns = np.log(prices).diff()
-    fwd = pd.DataFrame(index=prices.index)
-    for h in range(1, max_horizon + 1):
-        fwd_ret = returns.shift(-h).rolling(window=h).sum()
-        fwd[f"fwd_ret_{h}d"] = fwd_ret
-    return fwd
+    prices = pd.Series(prices).astype(float, copy=False)
+    values = prices.to_numpy()
+    out = _forward_returns_at(values, np.arange(len(values)), max_horizon)
+    columns = [f"fwd_ret_{h}d" for h in range(1, max_horizon + 1)]
+    return pd.DataFrame(out, index=prices.index, columns=columns)
+
+
+def _forward_returns_at(prices: np.ndarray, rows: np.ndarray, max_horizon: int) -> np.ndarray:
+    """Rows ``rows`` of :func:`compute_forward_returns` as a ``(len(rows), H)`` array."""
+    log_prices = np.log(prices)
+    # A forward sum of log returns telescopes to logP[t + h] - logP[t]; a
+    # missing price anywhere inside the window still voids it, as a rolling
+    # sum of the daily returns would.
+    gaps = np.concatenate(([0], np.cumsum(np.isnan(np.diff(log_prices)))))
+    out = np.full((len(rows), max_horizon), np.nan)
+    for h in range(1, min(max_horizon, len(log_prices) - 1) + 1):
+        valid = (rows >= h - 1) & (rows + h < len(log_prices))
+        start = rows[valid]
+        fwd_ret = log_prices[start + h] - log_prices[start]
+        fwd_ret[gaps[start + h] != gaps[start]] = np.nan
+        out[valid, h - 1] = fwd_ret
+    return out
 
 
 def calculate_statistics(fwd_returns: pd.DataFrame) -> pd.DataFrame:
     """Calculate summary statistics for forward returns."""
-    stats = pd.DataFrame(index=["mean", "median", "std", "skew", "kurt"])
-    for col in fwd_returns.columns:
-        series = fwd_returns[col].dropna()
-        if series.empty:
-            stats[col] = np.nan
-            continue
-        mean = series.mean()
-        median = series.median()
-        std = series.std(ddof=0)
-        skew = series.skew()
-        kurt = series.kurt()
-        stats[col] = [mean, median, std, skew, kurt]
+    # Column-wise reductions skip NaNs, matching a per-column dropna.
+    values = fwd_returns.astype(float)
+    stats = pd.DataFrame(
+        [values.mean(), values.median(), values.std(ddof=0), values.skew(), values.kurt()],
+        index=["mean", "median", "std", "skew", "kurt"],
+        columns=fwd_returns.columns,
+    )
     return stats
 
 
+def _symbol_picks(
+    symbol: str,
+    dates: pd.DatetimeIndex,
+    adj_arr: np.ndarray,
+    high_arr: np.ndarray,
+    low_arr: np.ndarray,
+    close_arr: np.ndarray,
+    volume_arr: Optional[np.ndarray],
+    cfg: IndicatorConfig,
+    max_horizon: int,
+) -> Optional[pd.DataFrame]:
+    """Evaluate one symbol's gap-free price arrays and return its picks, if any."""
+    indicator_names = cfg.enabled()
+    slots = {name: i for i, name in enumerate(indicator_names)}
+
+    # MACD and the EMA cross often share spans (12/26 by default), so each
+    # span's average of the adjusted price is computed once per symbol.
+    price_emas: Dict[int, np.ndarray] = {}
+
+    def price_ema(span: int) -> np.ndarray:
+        if span not in price_emas:
+            price_emas[span] = _ewm_mean(adj_arr, span)
+        return price_emas[span]
+
+    # One boolean column per enabled indicator, in ``cfg.enabled()`` order.
+    signals = np.zeros((len(dates), len(indicator_names)), dtype=bool)
+    if cfg.use_rsi:
+        signals[:, slots["RSI"]] = _rsi_arrays(
+            adj_arr,
+            cfg.rsi_n,
+            cfg.rsi_oversold,
+            cfg.rsi_overbought,
+            cfg.rsi_rule,
+        )[-1]
+    if cfg.use_adx:
+        signals[:, slots["ADX"]] = _adx_arrays(
+            high_arr,
+            low_arr,
+            close_arr,
+            cfg.adx_n,
+            cfg.adx_min,
+        )[-1]
+    if cfg.use_aroon:
+        signals[:, slots["Aroon"]] = _aroon_arrays(
+            high_arr,
+            low_arr,
+            cfg.aroon_n,
+            cfg.aroon_up,
+            cfg.aroon_dn,
+        )[-1]
+    if cfg.use_stoch:
+        signals[:, slots["Stochastic"]] = _stochastic_arrays(
+            high_arr,
+            low_arr,
+            close_arr,
+            cfg.stoch_k,
+            cfg.stoch_d,
+            cfg.stoch_rule,
+            cfg.stoch_thresh,
+        )[-1]
+    if cfg.use_macd:
+        signals[:, slots["MACD"]] = _macd_arrays(
+            price_ema(cfg.macd_fast),
+            price_ema(cfg.macd_slow),
+            cfg.macd_signal,
+            cfg.macd_rule,
+        )[-1]
+    if cfg.use_obv:
+        signals[:, slots["OBV"]] = _obv_arrays(
+            adj_arr,
+            volume_arr,
+            cfg.obv_rule,
+        )[-1]
+    if cfg.use_ema:
+        signals[:, slots["EMA"]] = _ema_cross_arrays(
+            price_ema(cfg.ema_short),
+            price_ema(cfg.ema_long),
+        )[-1]
+
+    # One byte per day holds every indicator's flag (there are at most seven),
+    # so the policy check, hit counts and labels are all byte lookups.
+    codes = _pack_signals(signals)
+    combined = _combine_packed_signals(codes, len(indicator_names), cfg.policy, cfg.atleast_k)
+    if not combined.any():
+        return None
+
+    # Forward returns are only needed on the (usually few) signal days.
+    rows = np.flatnonzero(combined)
+    fwd = _forward_returns_at(adj_arr, rows, max_horizon)
+    has_return = ~np.isnan(fwd).all(axis=1)
+    if not has_return.any():
+        return None
+    rows = rows[has_return]
+    fwd = fwd[has_return]
+    hit_codes = codes[rows, 0]
+    frame: Dict[str, Any] = {
+        "date": dates[rows],
+        "symbol": symbol,
+        "adj_close": adj_arr[rows],
+        "trigger_count": _POPCOUNT[hit_codes],
+        "triggered_signals": _signal_labels(tuple(indicator_names))[hit_codes],
+    }
+    for h in range(1, max_horizon + 1):
+        frame[f"fwd_ret_{h}d"] = fwd[:, h - 1]
+    return pd.DataFrame(frame)
+
+
 def run_backtest_for_all(
     adj_wide: pd.DataFrame,
     high_wide: pd.DataFrame,
@@ -594,12 +945,19 @@ def run_backtest_for_all(
     max_horizon: int = 10,
     hist_horizon: int = 1,
     allowed_symbols: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = None,
 ) -> Dict[str, pd.DataFrame]:
     """Run indicator-driven backtests across all tickers in the wide tables.
 
     Returns a dictionary with the combined trade ``picks``, summary
     ``statistics``, histogram-ready ``hist_data`` for the requested horizon,
-    and the filtered ``universe`` of tickers that were evaluated.
+    and the filtered ``universe`` of tickers that were evaluated.  The
+    ``date`` column of ``picks`` is always ``datetime64[ns]``, even when no
+    signals fired.
+
+    Symbols are independent, so ``max_workers`` greater than one spreads them
+    over a process pool.  Leave it unset when the caller is itself a pool
+    worker, as the API server's backtest tasks are.
     """
     cfg = IndicatorConfig.from_mapping(config)
     if not cfg.enabled():
@@ -607,29 +965,49 @@ def run_backtest_for_all(
     if hist_horizon < 1 or hist_horizon > max_horizon:
         raise ValueError("hist_horizon must be between 1 and max_horizon.")
 
-    def prep(frame: pd.DataFrame) -> pd.DataFrame:
+    parsed: List[Tuple[pd.Series, pd.DatetimeIndex, np.ndarray]] = []
+
+    def prep(frame: pd.DataFrame) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """Sorted distinct dates of a wide table and the row holding each one.
+
+        The first row per date wins, as ``drop_duplicates`` would keep it. The
+        table itself is never copied; tables sharing a date column with one
+        already seen reuse its parse.
+        """
         if frame is None:
             raise ValueError("Wide table is required but missing")
         if "date" not in frame.columns:
             raise ValueError("Wide tables must include a 'date' column.")
-        result = frame.copy()
-        result["date"] = pd.to_datetime(result["date"])
-        result = result.drop_duplicates(subset="date").set_index("date").sort_index()
-        return result
+        raw = frame["date"]
+        for seen_raw, seen_dates, seen_rows in parsed:
+            if raw.equals(seen_raw):
+                return seen_dates, seen_rows
+        stamps = pd.DatetimeIndex(pd.to_datetime(raw))
+        if stamps.is_monotonic_increasing and stamps.is_unique:
+            rows = np.arange(len(stamps))
+        else:
+            positions = pd.Series(np.arange(len(stamps)), index=stamps)
+            rows = positions[~stamps.duplicated()].sort_index().to_numpy()
+            stamps = stamps[rows]
+        parsed.append((raw, stamps, rows))
+        return stamps, rows
 
-    adj = prep(adj_wide)
-    high = prep(high_wide)
-    low = prep(low_wide)
-    close = prep(close_wide)
-    volume = prep(volume_wide) if volume_wide is not None else None
+    tables = [adj_wide, high_wide, low_wide, close_wide]
+    indexed = [prep(frame) for frame in tables]
+    if volume_wide is not None:
+        prep(volume_wide)
 
     allowed_set = set(allowed_symbols) if allowed_symbols is not None else None
-    tickers = [
+    adj_columns = [
         col
-        for col in adj.columns
-        if adj[col].notna().any() and (allowed_set is None or col in allowed_set)
+        for col in adj_wide.columns
+        if col != "date" and (allowed_set is None or col in allowed_set)
     ]
-    if cfg.use_obv and volume is None:
+    adj_dates, adj_rows = indexed[0]
+    adj_block = adj_wide[adj_columns].to_numpy(dtype=np.float64)[adj_rows]
+    has_data = ~np.isnan(adj_block).all(axis=0)
+    tickers = [col for col, ok in zip(adj_columns, has_data) if ok]
+    if cfg.use_obv and volume_wide is None:
         raise ValueError("Volume data is required when OBV is enabled.")
 
     min_obs = max(
@@ -642,129 +1020,80 @@ def run_backtest_for_all(
         cfg.ema_long if cfg.use_ema else 0,
     )
 
-    picks: List[Dict[str, Any]] = []
     return_cols = [f"fwd_ret_{h}d" for h in range(1, max_horizon + 1)]
 
-    for symbol in tickers:
-        if symbol not in high.columns or symbol not in low.columns or symbol not in close.columns:
-            continue
-        data = pd.DataFrame({
-            "adj": adj[symbol],
-            "high": high[symbol],
-            "low": low[symbol],
-            "close": close[symbol],
-        }).dropna(subset=["adj", "high", "low", "close"])
-        if data.empty or len(data) < min_obs:
-            continue
-        if cfg.use_obv:
-            if volume is None or symbol not in volume.columns:
-                raise ValueError(f"Volume data missing for symbol {symbol}.")
-            data = data.join(volume[symbol].rename("volume"))
-            data.dropna(subset="volume", inplace=True)
-            if data.empty:
+    # Evaluate every symbol on the dates all required tables share, with each
+    # table as one (T, S) float64 matrix whose columns are sliced by position.
+    if cfg.use_obv:
+        tables.append(volume_wide)
+        indexed.append(prep(volume_wide))
+    dates = adj_dates
+    for frame_dates, _ in indexed[1:]:
+        if not frame_dates.equals(dates):
+            dates = dates.intersection(frame_dates)
+    present = [
+        sym
+        for sym in tickers
+        if sym in high_wide.columns and sym in low_wide.columns and sym in close_wide.columns
+    ]
+
+    def shared_rows(frame_dates: pd.DatetimeIndex, frame_rows: np.ndarray) -> np.ndarray:
+        if frame_dates.equals(dates):
+            return frame_rows
+        return frame_rows[frame_dates.get_indexer(dates)]
+
+    # adj_block already holds adj's distinct dates, so its rows index into it.
+    adj_take = shared_rows(adj_dates, np.arange(len(adj_dates)))
+    adj_position = {sym: pos for pos, sym in enumerate(adj_columns)}
+    matrices = [adj_block[np.ix_(adj_take, [adj_position[sym] for sym in present])]]
+    for frame, (frame_dates, frame_rows) in zip(tables[1:], indexed[1:]):
+        block = frame.reindex(columns=present).to_numpy(dtype=np.float64)
+        matrices.append(block[shared_rows(frame_dates, frame_rows)])
+    volume_columns = set(volume_wide.columns) - {"date"} if cfg.use_obv else set()
+
+    def symbol_inputs() -> Iterator[Tuple[Any, ...]]:
+        for j, symbol in enumerate(present):
+            columns = [matrix[:, j] for matrix in matrices]
+            rows = ~np.isnan(columns[0])
+            for col in columns[1:4]:
+                rows &= ~np.isnan(col)
+            count = int(rows.sum())
+            if count == 0 or count < min_obs:
                 continue
+            volume_col = None
+            if cfg.use_obv:
+                if symbol not in volume_columns:
+                    raise ValueError(f"Volume data missing for symbol {symbol}.")
+                rows &= ~np.isnan(columns[4])
+                if not rows.any():
+                    continue
+                volume_col = columns[4][rows]
+            adj_col, high_col, low_col, close_col = (col[rows] for col in columns[:4])
+            yield symbol, dates[rows], adj_col, high_col, low_col, close_col, volume_col
+
+    if max_workers is not None and max_workers > 1:
+        batch = list(symbol_inputs())
+        chunksize = max(1, len(batch) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(
+                _symbol_picks,
+                *zip(*batch),
+                repeat(cfg),
+                repeat(max_horizon),
+                chunksize=chunksize,
+            )) if batch else []
+    else:
+        results = [_symbol_picks(*inputs, cfg, max_horizon) for inputs in symbol_inputs()]
+    frames = [frame for frame in results if frame is not None]
 
-        signal_map: Dict[str, pd.Series] = {}
-        if cfg.use_rsi:
-            _, sig = calculate_rsi(
-                data["adj"],
-                n=cfg.rsi_n,
-                oversold=cfg.rsi_oversold,
-                overbought=cfg.rsi_overbought,
-                rule=cfg.rsi_rule,
-            )
-            signal_map["RSI"] = sig.reindex(data.index).fillna(False)
-        if cfg.use_adx:
-            _, sig = calculate_adx(
-                data["high"],
-                data["low"],
-                data["close"],
-                n=cfg.adx_n,
-                min_adx=cfg.adx_min,
-            )
-            signal_map["ADX"] = sig.reindex(data.index).fillna(False)
-        if cfg.use_aroon:
-            _, sig = calculate_aroon(
-                data["high"],
-                data["low"],
-                n=cfg.aroon_n,
-                up_ge=cfg.aroon_up,
-                dn_le=cfg.aroon_dn,
-            )
-            signal_map["Aroon"] = sig.reindex(data.index).fillna(False)
-        if cfg.use_stoch:
-            _, sig = calculate_stochastic(
-                data["high"],
-                data["low"],
-                data["close"],
-                k_n=cfg.stoch_k,
-                d_n=cfg.stoch_d,
-                signal_rule=cfg.stoch_rule,
-                threshold=cfg.stoch_thresh,
-            )
-            signal_map["Stochastic"] = sig.reindex(data.index).fillna(False)
-        if cfg.use_macd:
-            _, sig = calculate_macd(
-                data["adj"],
-                fast_n=cfg.macd_fast,
-                slow_n=cfg.macd_slow,
-                signal_n=cfg.macd_signal,
-                rule=cfg.macd_rule,
-            )
-            signal_map["MACD"] = sig.reindex(data.index).fillna(False)
-        if cfg.use_obv:
-            _, sig = calculate_obv(
-                data["adj"],
-                data["volume"],
-                rule=cfg.obv_rule,
-            )
-            signal_map["OBV"] = sig.reindex(data.index).fillna(False)
-        if cfg.use_ema:
-            _, sig = calculate_ema_cross(
-                data["adj"],
-                short_n=cfg.ema_short,
-                long_n=cfg.ema_long,
-            )
-            signal_map["EMA"] = sig.reindex(data.index).fillna(False)
-
-        if not signal_map:
-            continue
-        signal_frame = pd.DataFrame(signal_map, index=data.index).fillna(False).astype(bool)
-        aligned_signals = [signal_frame[col] for col in signal_frame.columns]
-        combined = combine_signals(aligned_signals, policy=cfg.policy, k=cfg.atleast_k)
-        combined = combined.reindex(data.index).fillna(False).astype(bool)
-        if not combined.any():
-            continue
-
-        fwd = compute_forward_returns(data["adj"], max_horizon=max_horizon)
-        selected = fwd[combined]
-        selected = selected.dropna(how="all")
-        if selected.empty:
-            continue
-        signals_at_hits = signal_frame.loc[selected.index]
-        prices_at_hits = data.loc[selected.index, "adj"]
-
-        for ts in selected.index:
-            triggered = [name for name in signals_at_hits.columns if bool(signals_at_hits.at[ts, name])]
-            record: Dict[str, Any] = {
-                "date": ts,
-                "symbol": symbol,
-                "adj_close": prices_at_hits.at[ts],
-                "trigger_count": len(triggered),
-                "triggered_signals": ", ".join(triggered),
-            }
-            row = selected.loc[ts]
-            for col in selected.columns:
-                record[col] = row[col]
-            picks.append(record)
-
-    if picks:
-        picks_df = pd.DataFrame(picks)
+    if frames:
+        picks_df = pd.concat(frames, ignore_index=True)
+        picks_df["symbol"] = picks_df["symbol"].astype("category")
         picks_df.sort_values("date", inplace=True)
         picks_df.reset_index(drop=True, inplace=True)
     else:
         cols = ["date", "symbol", "adj_close", "trigger_count", "triggered_signals"] + return_cols
-        picks_df = pd.DataFrame(columns=cols)
+        picks_df = pd.DataFrame(columns=cols).astype({"date": "datetime64[ns]"})
 
     stats_df = calculate_statistics(picks_df[return_cols])
     hist_col = f"fwd_ret_{hist_horizon}d"
@@ -12,26 +12,71 @@ Run the module as a script to execute the full pipeline::
     python data_pipeline.py --output-dir data --start 2005-01-01
 
 Feather files are written to the chosen directory so that the R/Shiny or
-Python UI can load them quickly.
+Python UI can load them quickly; pass ``--format parquet`` to store the price
+tables as zstd-compressed Parquet instead.
 """
 
 from __future__ import annotations
 
 import argparse
+import datetime as dt
+import json
+import os
 import sys
 import time
 from io import StringIO
 import requests
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import pandas as pd
+import pyarrow as pa
 import yfinance as yf
 
 SP500_WIKI_URL = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
 DEFAULT_START = "2005-01-01"
-DEFAULT_CHUNK = 25
+DEFAULT_CHUNK = 100
+FEATHER_WRITE_OPTIONS = {"compression": "zstd", "compression_level": 3}
+PARQUET_WRITE_OPTIONS = {
+    "engine": "pyarrow",
+    "compression": "zstd",
+    "compression_level": 3,
+    "use_dictionary": True,
+    "data_page_size": 1 << 20,
+}
+OUTPUT_FORMATS = ("feather", "parquet")
+
+
+def _fetch_wiki_html(html_cache: Optional[Path] = None) -> str:
+    """Download the S&P 500 Wikipedia page, revalidating a cached copy.
+
+    With ``html_cache`` the page body is kept on disk next to its ``ETag`` and
+    ``Last-Modified`` validators (in a ``.json`` sidecar), and later requests
+    are conditional: a ``304 Not Modified`` reuses the stored body.
+    """
+    headers = {"User-Agent": "Mozilla/5.0 (compatible; CodexBot/1.0)"}
+    validators_path = html_cache.with_suffix(".json") if html_cache is not None else None
+    validators: Dict[str, str] = {}
+    if html_cache is not None and html_cache.exists() and validators_path.exists():
+        validators = json.loads(validators_path.read_text())
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+    response = requests.get(SP500_WIKI_URL, headers=headers, timeout=30)
+    if response.status_code == 304 and validators:
+        return html_cache.read_text(encoding="utf-8")
+    response.raise_for_status()
+    if html_cache is not None:
+        html_cache.parent.mkdir(parents=True, exist_ok=True)
+        html_cache.write_text(response.text, encoding="utf-8")
+        fresh = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        validators_path.write_text(json.dumps({k: v for k, v in fresh.items() if v}))
+    return response.text
 
 
 def fetch_sp500_components(
@@ -51,10 +96,8 @@ def fetch_sp500_components(
             return cached
         print("Cached symbol table missing sector metadata; refreshing ...", file=sys.stderr)
 
-    headers = {"User-Agent": "Mozilla/5.0 (compatible; CodexBot/1.0)"}
-    response = requests.get(SP500_WIKI_URL, headers=headers, timeout=30)
-    response.raise_for_status()
-    tables = pd.read_html(StringIO(response.text))
+    html_cache = cache_path.with_suffix(".html") if cache_path is not None else None
+    tables = pd.read_html(StringIO(_fetch_wiki_html(html_cache)))
     if not tables:
         raise RuntimeError("Unable to parse S&P 500 table from Wikipedia")
     df = tables[0]
@@ -73,7 +116,7 @@ def fetch_sp500_components(
     if cache_path is not None:
         cache_path.parent.mkdir(parents=True, exist_ok=True)
         if cache_path.suffix == ".feather":
-            df.to_feather(cache_path)
+            df.to_feather(cache_path, **FEATHER_WRITE_OPTIONS)
         elif cache_path.suffix in {".parquet", ".pq"}:
             df.to_parquet(cache_path, index=False)
         else:
@@ -87,27 +130,50 @@ def _chunked(items: Iterable[str], size: int) -> Iterable[List[str]]:
         yield items_list[i : i + size]
 
 
-def fetch_market_caps(symbols: List[str], max_workers: int = 8) -> pd.DataFrame:
-    """Fetch approximate market capitalisations using yfinance fast info."""
+def _full_info_enabled() -> bool:
+    value = os.getenv("BACKTEST_FULL_INFO", "")
+    return value.lower() in {"1", "true", "yes", "on"}
+
+
+# Market caps already looked up in this process, keyed on (symbol, day).
+_MARKET_CAP_CACHE: Dict[Tuple[str, dt.date], Optional[float]] = {}
+
+
+def fetch_market_caps(symbols: List[str], max_workers: int = 4) -> pd.DataFrame:
+    """Fetch approximate market capitalisations using yfinance fast info.
+
+    The ``Ticker`` objects come from one ``yf.Tickers`` batch so they share a
+    single HTTP session; lookups still run on a small thread pool because each
+    ``fast_info`` read is its own request, kept to a few workers to stay under
+    Yahoo's rate limits.  Results are memoised per process for the day.  The
+    slow full ``info`` scrape is only tried for missing values when
+    ``BACKTEST_FULL_INFO`` is set.
+    """
+    today = dt.date.today()
+    pending = [sym for sym in dict.fromkeys(symbols) if (sym, today) not in _MARKET_CAP_CACHE]
+    batch = yf.Tickers(" ".join(pending)).tickers if pending else {}
+    full_info = _full_info_enabled()
 
-    def _fetch(sym: str) -> Dict[str, Optional[float]]:
-        cap = None
+    def _fetch(sym: str) -> None:
         try:
-            ticker = yf.Ticker(sym)
+            ticker = batch.get(sym.upper()) or yf.Ticker(sym)
             fast = getattr(ticker, "fast_info", {}) or {}
             cap = fast.get("market_cap")
-            if cap is None:
+            if cap is None and full_info:
                 info = getattr(ticker, "info", {}) or {}
                 cap = info.get("marketCap")
         except Exception as exc:  # pragma: no cover - network errors are expected
             print(f"Market cap lookup failed for {sym}: {exc}", file=sys.stderr)
-        return {"symbol": sym, "market_cap": cap}
-
-    results: List[Dict[str, Optional[float]]] = []
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {executor.submit(_fetch, sym): sym for sym in symbols}
-        for fut in as_completed(futures):
-            results.append(fut.result())
+            return
+        _MARKET_CAP_CACHE[(sym, today)] = cap
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for fut in as_completed([executor.submit(_fetch, sym) for sym in pending]):
+                fut.result()
+    results: List[Dict[str, Optional[float]]] = [
+        {"symbol": sym, "market_cap": _MARKET_CAP_CACHE.get((sym, today))} for sym in symbols
+    ]
     return pd.DataFrame(results)
 
 
@@ -119,8 +185,15 @@ def download_ohlcv_history(
     pause: float = 1.0,
     max_retries: int = 3,
 ) -> pd.DataFrame:
-    """Download daily OHLCV data for all ``symbols`` using ``yfinance``."""
-    frames: List[pd.DataFrame] = []
+    """Download daily OHLCV data for all ``symbols`` using ``yfinance``.
+
+    Each chunk is one bulk ``yf.download`` call that fetches its tickers on
+    yfinance's own threads.  Chunks run one after another: ``yf.download``
+    keeps per-call results in module-level state, so concurrent calls would
+    clobber each other.  Failed calls are retried with backoff; empty results
+    are not.
+    """
+    tables: List[pa.Table] = []
     for chunk_idx, chunk in enumerate(_chunked(symbols, chunk_size), start=1):
         attempt = 0
         while attempt < max_retries:
@@ -145,14 +218,10 @@ def download_ohlcv_history(
                 continue
 
             if data.empty:
-                attempt += 1
-                wait = pause * (2**attempt)
-                print(
-                    f"Chunk {chunk_idx}: received empty frame; retry {attempt}/{max_retries} in {wait:.1f}s",
-                    file=sys.stderr,
-                )
-                time.sleep(wait)
-                continue
+                # An empty frame means Yahoo has nothing for these tickers;
+                # asking again returns the same, so move on.
+                print(f"Chunk {chunk_idx}: received empty frame; skipping", file=sys.stderr)
+                break
 
             try:
                 stacked = data.stack(level=0, future_stack=True).reset_index()
@@ -174,7 +243,7 @@ def download_ohlcv_history(
             stacked["date"] = pd.to_datetime(stacked["date"])
             stacked.sort_values(["symbol", "date"], inplace=True)
             stacked.dropna(subset=["adjusted"], inplace=True)
-            frames.append(stacked)
+            tables.append(pa.Table.from_pandas(stacked, preserve_index=False))
             print(
                 f"Chunk {chunk_idx}: downloaded {len(chunk)} tickers, {len(stacked)} rows",
                 file=sys.stderr,
@@ -185,16 +254,30 @@ def download_ohlcv_history(
                 f"Chunk {chunk_idx}: giving up after {max_retries} retries",
                 file=sys.stderr,
             )
-    if not frames:
+    if not tables:
         raise RuntimeError("No price data downloaded; check ticker list and network access")
-    combined = pd.concat(frames, ignore_index=True)
+    # Chunks are held as Arrow tables: concatenating them only links their
+    # buffers, and the conversion below releases each buffer once copied, so
+    # the rows are never held twice.
+    combined_table = pa.concat_tables(tables, promote_options="permissive")
+    del tables
+    combined = combined_table.to_pandas(split_blocks=True, self_destruct=True)
+    del combined_table
     combined.drop_duplicates(subset=["symbol", "date"], keep="last", inplace=True)
     combined.sort_values(["symbol", "date"], inplace=True)
+    # A few hundred distinct tickers over millions of rows: small integer
+    # codes make the reshape cheaper and are stored dictionary-encoded.
+    combined["symbol"] = combined["symbol"].astype("category")
     return combined
 
 
-def build_wide_tables(prices_long: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-    """Pivot the long-format price table into mentor-preferred wide tables."""
+def build_wide_tables(prices_long: pd.DataFrame, dtype_downcast: bool = False) -> Dict[str, pd.DataFrame]:
+    """Pivot the long-format price table into mentor-preferred wide tables.
+
+    With ``dtype_downcast`` the price tables are stored as ``float32``, halving
+    their size.  Volume keeps its dtype: missing days make it float, and large
+    share counts are not exact in ``float32``.
+    """
     pivot_cols = {
         "open_wide": "open",
         "high_wide": "high",
@@ -203,17 +286,83 @@ def build_wide_tables(prices_long: pd.DataFrame) -> Dict[str, pd.DataFrame]:
         "adjclose_wide": "adjusted",
         "volume_wide": "volume",
     }
+    # One reshape over all value columns instead of a pivot (and re-sort of
+    # the long frame) per column.
+    wide_all = (
+        prices_long.set_index(["date", "symbol"])[list(pivot_cols.values())]
+        .unstack("symbol")
+        .sort_index()
+    )
     wide_tables: Dict[str, pd.DataFrame] = {}
     for name, value_col in pivot_cols.items():
-        wide = (
-            prices_long.pivot(index="date", columns="symbol", values=value_col)
-            .sort_index()
-            .reset_index()
-        )
-        wide_tables[name] = wide
+        wide = wide_all[value_col]
+        if dtype_downcast and value_col != "volume":
+            wide = wide.astype("float32")
+        wide_tables[name] = wide.reset_index()
     return wide_tables
 
 
+def _write_table(df: pd.DataFrame, output_dir: Path, name: str, output_format: str) -> Path:
+    """Write ``df`` as ``name`` in the requested format and return its path."""
+    if output_format == "parquet":
+        path = output_dir / f"{name}.parquet"
+        df.to_parquet(path, index=False, **PARQUET_WRITE_OPTIONS)
+    elif output_format == "feather":
+        path = output_dir / f"{name}.feather"
+        df.to_feather(path, **FEATHER_WRITE_OPTIONS)
+    else:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return path
+
+
+def _read_table(output_dir: Path, name: str, output_format: str) -> Optional[pd.DataFrame]:
+    """Read ``name`` back in the given format, or ``None`` if it was never written."""
+    path = output_dir / f"{name}.{output_format}"
+    if not path.exists():
+        return None
+    if output_format == "parquet":
+        return pd.read_parquet(path)
+    return pd.read_feather(path)
+
+
+def download_incremental(
+    existing: pd.DataFrame,
+    symbols: List[str],
+    start: str = DEFAULT_START,
+    end: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK,
+) -> pd.DataFrame:
+    """Extend a previously downloaded long price table with newer rows only.
+
+    Each symbol is fetched from the day after its last stored date (symbols
+    not yet stored start at ``start``); symbols sharing a start date share one
+    download.  Yahoo restates adjusted closes after dividends and splits, which
+    a partial refresh cannot pick up, so rebuild in full now and then.
+    """
+    existing = existing[existing["symbol"].isin(symbols) & (existing["date"] >= pd.Timestamp(start))]
+    last_dates = existing.groupby("symbol", observed=True)["date"].max()
+    buckets: Dict[str, List[str]] = {}
+    for sym in symbols:
+        last = last_dates.get(sym)
+        sym_start = start if last is None else (last + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+        buckets.setdefault(sym_start, []).append(sym)
+
+    frames = [existing]
+    for sym_start, bucket in sorted(buckets.items()):
+        if end is not None and sym_start >= end:
+            continue
+        try:
+            frames.append(download_ohlcv_history(bucket, start=sym_start, end=end, chunk_size=chunk_size))
+        except RuntimeError:
+            print(f"No new rows for {len(bucket)} tickers since {sym_start}", file=sys.stderr)
+    combined = pd.concat(frames, ignore_index=True)
+    combined.drop_duplicates(subset=["symbol", "date"], keep="last", inplace=True)
+    combined.sort_values(["symbol", "date"], inplace=True)
+    combined.reset_index(drop=True, inplace=True)
+    combined["symbol"] = combined["symbol"].astype("category")
+    return combined
+
+
 def run_pipeline(
     output_dir: Path,
     start: str = DEFAULT_START,
@@ -222,11 +371,23 @@ def run_pipeline(
     chunk_size: int = DEFAULT_CHUNK,
     limit: Optional[int] = None,
     skip_market_cap: bool = False,
+    output_format: str = "feather",
+    dtype_downcast: bool = False,
+    incremental: bool = False,
 ) -> None:
-    """Execute the full data pipeline and persist artifacts to ``output_dir``."""
+    """Execute the full data pipeline and persist artifacts to ``output_dir``.
+
+    ``output_format`` selects how the long and wide price tables are stored.
+    The API server memory-maps the feather files, so ``"parquet"`` is for
+    other consumers that prefer smaller files on disk.  ``dtype_downcast``
+    stores the wide price tables as ``float32`` (see :func:`build_wide_tables`).
+    With ``incremental`` an existing ``prices_long`` table is extended with
+    newer rows instead of downloaded again (see :func:`download_incremental`).
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
     output_dir.mkdir(parents=True, exist_ok=True)
     symbols_path = output_dir / "sp500_symbols.feather"
-    prices_path = output_dir / "prices_long.feather"
 
     symbols = fetch_sp500_components(symbols_path, refresh=refresh_symbols)
     print(f"Fetched {len(symbols)} S&P 500 symbols", file=sys.stderr)
@@ -235,12 +396,17 @@ def run_pipeline(
     if limit is not None:
         requested = requested[:limit]
         print(f"Limiting download to first {limit} tickers", file=sys.stderr)
-    price_df = download_ohlcv_history(
-        requested,
-        start=start,
-        end=end,
-        chunk_size=chunk_size,
-    )
+    existing = _read_table(output_dir, "prices_long", output_format) if incremental else None
+    if existing is not None:
+        print(f"Extending {len(existing):,} stored price rows", file=sys.stderr)
+        price_df = download_incremental(existing, requested, start=start, end=end, chunk_size=chunk_size)
+    else:
+        price_df = download_ohlcv_history(
+            requested,
+            start=start,
+            end=end,
+            chunk_size=chunk_size,
+        )
     downloaded = sorted(price_df["symbol"].unique())
     missing = sorted(set(requested) - set(downloaded))
     if missing:
@@ -248,19 +414,21 @@ def run_pipeline(
         suffix = '...' if len(missing) > 10 else ''
         print(f"Missing {len(missing)} tickers: {preview}{suffix}", file=sys.stderr)
     print(f"Combined price rows: {len(price_df):,}", file=sys.stderr)
-    price_df.to_feather(prices_path)
+    _write_table(price_df, output_dir, "prices_long", output_format)
 
-    wide_tables = build_wide_tables(price_df)
+    wide_tables = build_wide_tables(price_df, dtype_downcast=dtype_downcast)
     for name, table in wide_tables.items():
-        table.to_feather(output_dir / f"{name}.feather")
-        print(f"Wrote {name}.feather", file=sys.stderr)
+        path = _write_table(table, output_dir, name, output_format)
+        print(f"Wrote {path.name}", file=sys.stderr)
 
     metadata = symbols.copy()
     if not skip_market_cap:
         print("Fetching market capitalisations ...", file=sys.stderr)
         market_caps = fetch_market_caps(requested)
         metadata = metadata.merge(market_caps, on="symbol", how="left")
-    metadata.to_feather(output_dir / "sp500_metadata.feather")
+    # The API keys the universe on ``ticker``; store it under that name.
+    metadata = metadata.rename(columns={"symbol": "ticker"})
+    metadata.to_feather(output_dir / "sp500_metadata.feather", **FEATHER_WRITE_OPTIONS)
     print("Wrote sp500_metadata.feather", file=sys.stderr)
 
 
@@ -273,6 +441,24 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser.add_argument("--chunk-size", default=DEFAULT_CHUNK, type=int, help="Ticker batch size for downloads")
     parser.add_argument("--limit", type=int, default=None, help="Process only the first N tickers (debug)")
     parser.add_argument("--skip-market-cap", action="store_true", help="Do not fetch market cap metadata")
+    parser.add_argument(
+        "--format",
+        dest="output_format",
+        choices=OUTPUT_FORMATS,
+        default="feather",
+        help="Storage format for the price tables (the API server reads feather)",
+    )
+    parser.add_argument(
+        "--float32",
+        dest="dtype_downcast",
+        action="store_true",
+        help="Store the wide price tables as float32 to halve their size",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only download rows newer than the stored prices_long table",
+    )
     return parser.parse_args(argv)
 
 
@@ -286,4 +472,7 @@ if __name__ == "__main__":
         chunk_size=args.chunk_size,
         limit=args.limit,
         skip_market_cap=args.skip_market_cap,
+        output_format=args.output_format,
+        dtype_downcast=args.dtype_downcast,
+        incremental=args.incremental,
     )
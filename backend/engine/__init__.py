@@ -2,7 +2,7 @@
 
 from .fees import FeeModel
 from .execution import TradeBuilderConfig, ExecutionResult, build_trades_from_picks
-from .pnl import build_equity_curve, compute_drawdown, warn_if_returns_constant
+from .pnl import build_curves_and_metrics, build_equity_curve, compute_drawdown, warn_if_returns_constant
 from .metrics import compute_performance_metrics
 
 __all__ = [
@@ -11,6 +11,7 @@ __all__ = [
     "ExecutionResult",
     "build_trades_from_picks",
     "build_equity_curve",
+    "build_curves_and_metrics",
     "compute_drawdown",
     "warn_if_returns_constant",
     "compute_performance_metrics",
@@ -0,0 +1,44 @@
+"""Optional Numba support for the engine's numeric kernels.
+
+Kernels are written as plain loops and decorated with :func:`njit`.  When
+``numba`` is installed they are compiled to machine code; otherwise the
+decorator is a no-op and the same code runs as ordinary Python.
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit as _numba_njit
+except ImportError:  # pragma: no cover - optional dependency
+    _numba_njit = None
+
+NUMBA_AVAILABLE = _numba_njit is not None
+
+# Numba's on-disk cache records the defining module's import name, and loading
+# an entry under a different name fails. Modules reachable both as
+# ``backend.x`` and as a top-level ``x`` (``backend/`` is on ``sys.path`` for
+# the API server) therefore only cache under the canonical package name.
+_CACHE_PACKAGE = "backend."
+
+
+def njit(*args, **kwargs):
+    """Compile with ``numba.njit`` when available, otherwise return the function."""
+
+    if _numba_njit is not None:
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return _numba_njit(args[0])
+
+        def compile_(func):
+            options = dict(kwargs)
+            if options.get("cache") and not func.__module__.startswith(_CACHE_PACKAGE):
+                options["cache"] = False
+            return _numba_njit(*args, **options)(func)
+
+        return compile_
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+
+    def decorator(func):
+        return func
+
+    return decorator
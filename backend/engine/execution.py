@@ -5,12 +5,13 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from pandas.tseries import offsets
 
+from ._njit import njit
 from .fees import FeeModel
 
 logger = logging.getLogger(__name__)
@@ -41,6 +42,59 @@ class ExecutionResult:
     ledger: pd.DataFrame
 
 
+@njit(
+    "Tuple((float64[:], float64[:], boolean[:]))(float64[:], float64[:], boolean[:], float64, float64)",
+    cache=True,
+)
+def _exit_prices_kernel(
+    raw_returns: np.ndarray,
+    enter_prices: np.ndarray,
+    dates_ok: np.ndarray,
+    lower: float,
+    upper: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Clip simple returns to ``[lower, upper]`` and price exits in one pass.
+
+    Returns the clipped simple returns, the exit prices and a mask of rows
+    that make a usable trade (dated, finite log return, positive prices).
+    """
+
+    n = raw_returns.size
+    gross = np.full(n, np.nan)
+    exit_prices = np.full(n, np.nan)
+    keep = np.zeros(n, dtype=np.bool_)
+    for i in range(n):
+        raw = raw_returns[i]
+        price = enter_prices[i]
+        if not dates_ok[i] or np.isnan(raw) or not price > 0:
+            continue
+        simple = np.expm1(raw)
+        if simple < lower:
+            simple = lower
+        if simple > upper:
+            simple = upper
+        exit_price = price * (1.0 + simple)
+        gross[i] = simple
+        exit_prices[i] = exit_price
+        keep[i] = exit_price > 0
+    return gross, exit_prices, keep
+
+
+def _compute_exit_dates(enter_dates: pd.DatetimeIndex, hold_days: int) -> pd.DatetimeIndex:
+    """Midnight ``hold_days`` business days after each entry.
+
+    Matches ``(enter_dates + BDay(hold_days)).normalize()``: rolling weekend
+    entries back to Friday before counting lands on the same day as pandas'
+    roll-forward-counts-as-one rule.
+    """
+
+    if enter_dates.tz is not None:
+        return (enter_dates + offsets.BDay(hold_days)).normalize()
+    days = enter_dates.values.astype("datetime64[D]")
+    exits = np.busday_offset(days, hold_days, roll="backward")
+    return pd.DatetimeIndex(exits.astype("datetime64[ns]"))
+
+
 def _prepare_candidates(
     picks: pd.DataFrame,
     hold_days: int,
@@ -73,45 +127,47 @@ def _prepare_candidates(
             ]
         )
 
-    records: List[Dict[str, object]] = []
     stop_loss = abs(stop_loss_pct) if stop_loss_pct is not None else None
     take_profit = take_profit_pct if take_profit_pct is not None else None
 
-    for row in picks.itertuples():
-        enter_price = float(getattr(row, "adj_close", np.nan))
-        enter_date = getattr(row, "date", None)
-        raw_ret = getattr(row, ret_col, np.nan)
-        symbol = getattr(row, "symbol", None)
-        if pd.isna(raw_ret) or pd.isna(enter_price) or enter_price <= 0:
-            continue
-        if not isinstance(enter_date, pd.Timestamp):
-            enter_date = pd.to_datetime(enter_date)
-        if pd.isna(enter_date):
-            continue
-
-        gross_simple = float(np.expm1(raw_ret))
-        if stop_loss is not None:
-            gross_simple = max(gross_simple, -stop_loss)
-        if take_profit is not None:
-            gross_simple = min(gross_simple, take_profit)
-
-        exit_price = enter_price * (1.0 + gross_simple)
-        if exit_price <= 0:
-            continue
-        exit_date = (enter_date + offsets.BDay(hold_days)).normalize()
-
-        records.append(
-            {
-                "enter_date": enter_date.normalize(),
-                "exit_date": exit_date,
-                "symbol": symbol,
-                "enter_price": enter_price,
-                "exit_price": float(exit_price),
-                "gross_return": float(gross_simple),
-            }
-        )
-
-    candidates = pd.DataFrame(records)
+    count = len(picks)
+    raw_returns = picks[ret_col].to_numpy(dtype=np.float64)
+    if "adj_close" in picks.columns:
+        enter_prices = picks["adj_close"].to_numpy(dtype=np.float64)
+    else:
+        enter_prices = np.full(count, np.nan)
+    if "date" in picks.columns:
+        enter_dates = pd.DatetimeIndex(pd.to_datetime(picks["date"]))
+    else:
+        enter_dates = pd.DatetimeIndex(np.full(count, np.datetime64("NaT", "ns")))
+    if "symbol" in picks.columns:
+        symbols = picks["symbol"].to_numpy(dtype=object)
+    else:
+        symbols = np.full(count, None, dtype=object)
+
+    gross_simple, exit_prices, keep = _exit_prices_kernel(
+        raw_returns,
+        enter_prices,
+        ~enter_dates.isna(),
+        -stop_loss if stop_loss is not None else -np.inf,
+        take_profit if take_profit is not None else np.inf,
+    )
+    rows = np.flatnonzero(keep)
+    if rows.size == 0:
+        return pd.DataFrame()
+    kept_dates = enter_dates[rows]
+    exit_dates = _compute_exit_dates(kept_dates, hold_days)
+
+    candidates = pd.DataFrame(
+        {
+            "enter_date": kept_dates.normalize(),
+            "exit_date": exit_dates,
+            "symbol": symbols[rows],
+            "enter_price": enter_prices[rows],
+            "exit_price": exit_prices[rows],
+            "gross_return": gross_simple[rows],
+        }
+    )
     if candidates.empty:
         return candidates
 
@@ -120,25 +176,242 @@ def _prepare_candidates(
     return candidates
 
 
-def _max_active_positions(trades: pd.DataFrame) -> int:
-    if trades.empty:
+# Event kinds and per-event outcomes reported by ``_simulate_events``.
+_EXIT = 0
+_ENTRY = 1
+_EXECUTED = 0
+_NO_SLOTS = 1
+_NO_CASH = 2
+_BAD_QUANTITY = 3
+_OVER_CASH = 4
+_NOT_OPEN = 5
+
+# Columns of the per-event value matrix returned by ``_simulate_events``.
+_QUANTITY, _NOTIONAL, _FEE, _PNL, _CASH, _EQUITY, _ALLOCATION = range(7)
+
+
+def _event_schedule(
+    enter_dates: pd.DatetimeIndex, exit_dates: pd.DatetimeIndex
+) -> Tuple[np.ndarray, np.ndarray, pd.DatetimeIndex]:
+    """Order every trade's entry and exit event for replay.
+
+    Events run in time order, exits before entries on the same day, then in
+    candidate order.  Returns the trade index, kind and timestamp per event.
+    """
+
+    count = len(enter_dates)
+    # ``asi8`` is the UTC nanosecond value, so tz-aware dates order the same.
+    enter_ns = enter_dates.asi8
+    exit_ns = exit_dates.asi8
+    ids = np.arange(count, dtype=np.int64)
+    # Exits take positions [0, count) and entries [count, 2 * count).
+    stamps = exit_dates.append(enter_dates)
+    if count > 1 and ((np.diff(enter_ns) < 0).any() or (np.diff(exit_ns) < 0).any()):
+        trade_ids = np.concatenate((ids, ids))
+        kinds = np.concatenate((np.full(count, _EXIT, dtype=np.int64), np.full(count, _ENTRY, dtype=np.int64)))
+        # Exits are laid out first, so a stable sort on (ts, kind) keeps
+        # candidate order among ties.
+        order = np.argsort(np.concatenate((exit_ns, enter_ns)) * 2 + kinds, kind="stable")
+        return trade_ids[order], kinds[order], stamps[order]
+
+    # Candidates sorted by entry come out sorted by exit too (a fixed
+    # business-day hold is monotonic), so the two event streams only need
+    # merging: each event's slot is its own rank plus the number of events
+    # from the other stream that go before it.
+    entry_slots = ids + np.searchsorted(exit_ns, enter_ns, side="right")
+    exit_slots = ids + np.searchsorted(enter_ns, exit_ns, side="left")
+    trade_ids = np.empty(2 * count, dtype=np.int64)
+    kinds = np.empty(2 * count, dtype=np.int64)
+    source = np.empty(2 * count, dtype=np.int64)
+    trade_ids[entry_slots] = ids
+    trade_ids[exit_slots] = ids
+    kinds[entry_slots] = _ENTRY
+    kinds[exit_slots] = _EXIT
+    source[entry_slots] = ids + count
+    source[exit_slots] = ids
+    return trade_ids, kinds, stamps[source]
+
+
+def _max_active_positions(event_kinds: np.ndarray) -> int:
+    """Peak number of simultaneously open trades over an ordered schedule."""
+
+    if event_kinds.size == 0:
         return 0
-    events: List[Tuple[pd.Timestamp, int]] = []
-    for row in trades.itertuples():
-        events.append((row.enter_date, 1))
-        events.append((row.exit_date, -1))
-    events.sort(key=lambda item: (item[0], item[1]))
-    active = 0
-    max_active = 0
-    for _, delta in events:
-        active += delta
-        max_active = max(max_active, active)
-    return max_active
-
-
-def _current_equity(cash: float, open_positions: Dict[int, Dict[str, float]]) -> float:
-    float_positions = sum(pos["market_value"] for pos in open_positions.values())
-    return cash + float_positions
+    return int(max(0, np.cumsum(np.where(event_kinds == _ENTRY, 1, -1)).max()))
+
+
+@njit("float64(float64, float64)", cache=True)
+def _fee_for_notional(notional: float, rate: float) -> float:
+    """Compiled twin of :meth:`FeeModel.fee_for_notional` for the event kernel."""
+
+    return notional * rate if notional > 0 else 0.0
+
+
+@njit(
+    "Tuple((int64[:], float64[:, :], float64[:, :]))"
+    "(int64[:], int64[:], float64[:], float64[:], float64, float64, int64, boolean)",
+    cache=True,
+)
+def _simulate_events(
+    kinds: np.ndarray,
+    trade_ids: np.ndarray,
+    enter_prices: np.ndarray,
+    exit_prices: np.ndarray,
+    fee_rate: float,
+    initial_capital: float,
+    max_active: int,
+    compound: bool,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Replay time-ordered entry/exit events against a cash account.
+
+    Returns the outcome code of every event, a ``(events, 7)`` matrix of
+    quantity, notional, fee, pnl, cash, equity and allocation per event, and a
+    ``(trades, 4)`` matrix of quantity, buy notional, buy fee and allocated
+    capital for every trade that was opened.
+    """
+
+    n_events = kinds.size
+    n_trades = enter_prices.size
+    status = np.zeros(n_events, dtype=np.int64)
+    values = np.full((n_events, 7), np.nan)
+    positions = np.full((n_trades, 4), np.nan)
+    is_open = np.zeros(n_trades, dtype=np.bool_)
+    # Open trades in the order they were entered, so equity sums the same way
+    # a walk over the open positions would.
+    open_ids = np.empty(n_trades, dtype=np.int64)
+    n_open = 0
+    cash = initial_capital
+    for e in range(n_events):
+        idx = trade_ids[e]
+        if kinds[e] == _ENTRY:
+            available_slots = max_active - n_open
+            if available_slots <= 0:
+                status[e] = _NO_SLOTS
+                continue
+            if compound:
+                allocation_base = cash / available_slots
+            else:
+                allocation_base = initial_capital / max_active
+            allocation = cash if cash < allocation_base else allocation_base
+            values[e, _ALLOCATION] = allocation
+            if allocation <= 0:
+                status[e] = _NO_CASH
+                continue
+            price = enter_prices[idx]
+            denominator = price * (1.0 + fee_rate)
+            quantity = allocation / denominator if denominator > 0 else 0.0
+            if quantity <= 0 or not np.isfinite(quantity):
+                status[e] = _BAD_QUANTITY
+                continue
+            buy_notional = price * quantity
+            buy_fee = _fee_for_notional(buy_notional, fee_rate)
+            total_cost = buy_notional + buy_fee
+            if total_cost - cash > 1e-6:
+                status[e] = _OVER_CASH
+                values[e, _NOTIONAL] = buy_notional
+                values[e, _FEE] = buy_fee
+                values[e, _CASH] = cash
+                continue
+            cash -= total_cost
+            positions[idx, 0] = quantity
+            positions[idx, 1] = buy_notional
+            positions[idx, 2] = buy_fee
+            positions[idx, 3] = allocation
+            is_open[idx] = True
+            open_ids[n_open] = idx
+            n_open += 1
+            pnl = 0.0
+            notional = buy_notional
+            fee = buy_fee
+        else:
+            if not is_open[idx]:
+                status[e] = _NOT_OPEN
+                continue
+            is_open[idx] = False
+            for k in range(n_open):
+                if open_ids[k] == idx:
+                    open_ids[k:n_open - 1] = open_ids[k + 1:n_open]
+                    break
+            n_open -= 1
+            quantity = positions[idx, 0]
+            buy_notional = positions[idx, 1]
+            notional = exit_prices[idx] * quantity
+            fee = _fee_for_notional(notional, fee_rate)
+            cash += notional - fee
+            gross_pnl = notional - buy_notional
+            total_fees = positions[idx, 2] + fee
+            pnl = gross_pnl - total_fees
+        open_value = 0.0
+        for k in range(n_open):
+            open_value += positions[open_ids[k], 1]
+        values[e, _QUANTITY] = quantity
+        values[e, _NOTIONAL] = notional
+        values[e, _FEE] = fee
+        values[e, _PNL] = pnl
+        values[e, _CASH] = cash
+        values[e, _EQUITY] = cash + open_value
+    return status, values, positions
+
+
+def _log_events(
+    status: np.ndarray,
+    values: np.ndarray,
+    event_kinds: np.ndarray,
+    event_ids: np.ndarray,
+    event_ts: pd.DatetimeIndex,
+    symbols: np.ndarray,
+    enter_prices: np.ndarray,
+    exit_prices: np.ndarray,
+) -> None:
+    """Emit the per-event log records of a replay, in event order.
+
+    Rejected entries are always logged as errors; the remaining records are
+    debug output and only walked when debug logging is enabled.
+    """
+
+    if logger.isEnabledFor(logging.DEBUG):
+        events = np.flatnonzero(status != _NOT_OPEN)
+    else:
+        events = np.flatnonzero((status == _BAD_QUANTITY) | (status == _OVER_CASH))
+    for e in events:
+        code = status[e]
+        idx = event_ids[e]
+        symbol = symbols[idx]
+        if code == _BAD_QUANTITY:
+            logger.error(
+                "Computed invalid quantity",
+                extra={"symbol": symbol, "allocation": values[e, _ALLOCATION]},
+            )
+        elif code == _OVER_CASH:
+            logger.error(
+                "Trade would exceed available cash",
+                extra={
+                    "symbol": symbol,
+                    "cost": values[e, _NOTIONAL] + values[e, _FEE],
+                    "cash": values[e, _CASH],
+                },
+            )
+        elif code == _NO_SLOTS:
+            logger.debug("Skipping entry due to zero available slots", extra={"symbol": symbol})
+        elif code == _NO_CASH:
+            logger.debug("Insufficient cash for entry", extra={"symbol": symbol})
+        else:
+            buy = event_kinds[e] == _ENTRY
+            logger.debug(
+                "EXECUTE BUY" if buy else "EXECUTE SELL",
+                extra={
+                    "ts": pd.Timestamp(event_ts[e]),
+                    "symbol": symbol,
+                    "side": "buy" if buy else "sell",
+                    "qty": values[e, _QUANTITY],
+                    "price": enter_prices[idx] if buy else exit_prices[idx],
+                    "notional": values[e, _NOTIONAL],
+                    "fee": values[e, _FEE],
+                    "pnl": values[e, _PNL],
+                    "cash": values[e, _CASH],
+                    "equity": values[e, _EQUITY],
+                },
+            )
 
 
 def build_trades_from_picks(picks: pd.DataFrame, config: TradeBuilderConfig) -> ExecutionResult:
@@ -176,155 +449,84 @@ def build_trades_from_picks(picks: pd.DataFrame, config: TradeBuilderConfig) ->
 
     fee_model = config.fee_model
     initial_capital = max(1.0, float(config.initial_capital))
-    max_active = max(1, _max_active_positions(candidates))
-    open_positions: Dict[int, Dict[str, float]] = {}
-    ledger: List[Dict[str, float]] = []
-    realised: List[Dict[str, float]] = []
-
-    cash = float(initial_capital)
-
-    events: List[Tuple[pd.Timestamp, str, int]] = []
-    for idx, row in candidates.iterrows():
-        events.append((row["enter_date"], "entry", idx))
-        events.append((row["exit_date"], "exit", idx))
-    events.sort(key=lambda item: (item[0], 0 if item[1] == "exit" else 1))
-
-    for ts, event_type, idx in events:
-        row = candidates.loc[idx]
-        symbol = row.get("symbol")
-        if event_type == "entry":
-            available_slots = max_active - len(open_positions)
-            if available_slots <= 0:
-                logger.debug("Skipping entry due to zero available slots", extra={"symbol": symbol})
-                continue
-            if config.compound:
-                allocation_base = cash / available_slots
-            else:
-                allocation_base = initial_capital / max_active
-            allocation = min(allocation_base, cash)
-            if allocation <= 0:
-                logger.debug("Insufficient cash for entry", extra={"symbol": symbol})
-                continue
-            denominator = row["enter_price"] * (1.0 + fee_model.rate)
-            quantity = allocation / denominator if denominator > 0 else 0.0
-            if quantity <= 0 or not np.isfinite(quantity):
-                logger.error("Computed invalid quantity", extra={"symbol": symbol, "allocation": allocation})
-                continue
-            buy_notional = row["enter_price"] * quantity
-            buy_fee = fee_model.fee_for_notional(buy_notional)
-            total_cost = buy_notional + buy_fee
-            if total_cost - cash > 1e-6:
-                logger.error(
-                    "Trade would exceed available cash", extra={"symbol": symbol, "cost": total_cost, "cash": cash}
-                )
-                continue
-            cash -= total_cost
-            open_positions[idx] = {
-                "quantity": quantity,
-                "buy_notional": buy_notional,
-                "buy_fee": buy_fee,
-                "enter_price": row["enter_price"],
-                "capital_allocated": allocation,
-                "market_value": buy_notional,
-            }
-            equity = _current_equity(cash, open_positions)
-            logger.debug(
-                "EXECUTE BUY",
-                extra={
-                    "ts": ts,
-                    "symbol": symbol,
-                    "side": "buy",
-                    "qty": quantity,
-                    "price": row["enter_price"],
-                    "notional": buy_notional,
-                    "fee": buy_fee,
-                    "pnl": 0.0,
-                    "cash": cash,
-                    "equity": equity,
-                },
-            )
-            ledger.append(
-                {
-                    "ts": ts,
-                    "event": "buy",
-                    "symbol": symbol,
-                    "side": "buy",
-                    "quantity": quantity,
-                    "price": row["enter_price"],
-                    "notional": buy_notional,
-                    "fee": buy_fee,
-                    "pnl": 0.0,
-                    "cash": cash,
-                    "equity": equity,
-                }
-            )
-        else:
-            position = open_positions.pop(idx, None)
-            if position is None:
-                continue
-            quantity = position["quantity"]
-            buy_notional = position["buy_notional"]
-            buy_fee = position["buy_fee"]
-            sell_notional = row["exit_price"] * quantity
-            sell_fee = fee_model.fee_for_notional(sell_notional)
-            cash += sell_notional - sell_fee
-            gross_pnl = sell_notional - buy_notional
-            total_fees = buy_fee + sell_fee
-            net_pnl = gross_pnl - total_fees
-            net_return = net_pnl / abs(buy_notional) if buy_notional != 0 else 0.0
-            equity = _current_equity(cash, open_positions)
-            logger.debug(
-                "EXECUTE SELL",
-                extra={
-                    "ts": ts,
-                    "symbol": symbol,
-                    "side": "sell",
-                    "qty": quantity,
-                    "price": row["exit_price"],
-                    "notional": sell_notional,
-                    "fee": sell_fee,
-                    "pnl": net_pnl,
-                    "cash": cash,
-                    "equity": equity,
-                },
-            )
-            ledger.append(
-                {
-                    "ts": ts,
-                    "event": "sell",
-                    "symbol": symbol,
-                    "side": "sell",
-                    "quantity": quantity,
-                    "price": row["exit_price"],
-                    "notional": sell_notional,
-                    "fee": sell_fee,
-                    "pnl": net_pnl,
-                    "cash": cash,
-                    "equity": equity,
-                }
-            )
-            realised.append(
-                {
-                    "enter_date": row["enter_date"],
-                    "exit_date": row["exit_date"],
-                    "symbol": symbol,
-                    "side": "long",
-                    "enter_price": row["enter_price"],
-                    "exit_price": row["exit_price"],
-                    "quantity": quantity,
-                    "buy_notional": buy_notional,
-                    "sell_notional": sell_notional,
-                    "buy_fee": buy_fee,
-                    "sell_fee": sell_fee,
-                    "gross_pnl": gross_pnl,
-                    "net_pnl": net_pnl,
-                    "gross_return": row["gross_return"],
-                    "net_return": net_return,
-                    "capital_allocated": position["capital_allocated"],
-                    "fees": total_fees,
-                    "notional": buy_notional,
-                }
-            )
-    trades_df = pd.DataFrame(realised, columns=empty_cols)
-    ledger_df = pd.DataFrame(ledger, columns=ledger_cols)
+    enter_dates = pd.DatetimeIndex(candidates["enter_date"])
+    exit_dates = pd.DatetimeIndex(candidates["exit_date"])
+    symbols = candidates["symbol"].to_numpy(dtype=object)
+    enter_prices = candidates["enter_price"].to_numpy(dtype=np.float64)
+    exit_prices = candidates["exit_price"].to_numpy(dtype=np.float64)
+
+    event_ids, event_kinds, event_ts = _event_schedule(enter_dates, exit_dates)
+    max_active = max(1, _max_active_positions(event_kinds))
+
+    status, values, positions = _simulate_events(
+        event_kinds,
+        event_ids,
+        enter_prices,
+        exit_prices,
+        fee_model.rate,
+        initial_capital,
+        max_active,
+        bool(config.compound),
+    )
+    _log_events(status, values, event_kinds, event_ids, event_ts, symbols, enter_prices, exit_prices)
+
+    done = np.flatnonzero(status == _EXECUTED)
+    if done.size == 0:
+        return ExecutionResult(pd.DataFrame(columns=empty_cols), pd.DataFrame(columns=ledger_cols))
+    done_ids = event_ids[done]
+    is_buy = event_kinds[done] == _ENTRY
+    sides = np.where(is_buy, "buy", "sell").astype(object)
+    ledger_df = pd.DataFrame(
+        {
+            "ts": event_ts[done],
+            "event": sides,
+            "symbol": symbols[done_ids],
+            "side": sides.copy(),
+            "quantity": values[done, _QUANTITY],
+            "price": np.where(is_buy, enter_prices[done_ids], exit_prices[done_ids]),
+            "notional": values[done, _NOTIONAL],
+            "fee": values[done, _FEE],
+            "pnl": values[done, _PNL],
+            "cash": values[done, _CASH],
+            "equity": values[done, _EQUITY],
+        },
+        columns=ledger_cols,
+        copy=False,
+    )
+
+    sold = done[~is_buy]
+    if sold.size == 0:
+        return ExecutionResult(trades=pd.DataFrame(columns=empty_cols), ledger=ledger_df)
+    ids = event_ids[sold]
+    buy_notional = positions[ids, 1]
+    buy_fee = positions[ids, 2]
+    sell_notional = values[sold, _NOTIONAL]
+    sell_fee = values[sold, _FEE]
+    net_pnl = values[sold, _PNL]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        net_return = np.where(buy_notional != 0, net_pnl / np.abs(buy_notional), 0.0)
+    trades_df = pd.DataFrame(
+        {
+            "enter_date": enter_dates[ids],
+            "exit_date": exit_dates[ids],
+            "symbol": symbols[ids],
+            "side": np.full(ids.size, "long", dtype=object),
+            "enter_price": enter_prices[ids],
+            "exit_price": exit_prices[ids],
+            "quantity": positions[ids, 0],
+            "buy_notional": buy_notional,
+            "sell_notional": sell_notional,
+            "buy_fee": buy_fee,
+            "sell_fee": sell_fee,
+            "gross_pnl": sell_notional - buy_notional,
+            "net_pnl": net_pnl,
+            "net_return": net_return,
+            "gross_return": candidates["gross_return"].to_numpy(dtype=np.float64)[ids],
+            "capital_allocated": positions[ids, 3],
+            "fees": buy_fee + sell_fee,
+            "notional": buy_notional,
+        },
+        columns=empty_cols,
+        copy=False,
+    )
     return ExecutionResult(trades=trades_df, ledger=ledger_df)
@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class FeeModel:
@@ -24,9 +26,14 @@ class FeeModel:
     def fee_for_notional(self, notional: float) -> float:
         """Compute the fee charged for a given traded notional."""
 
-        if notional <= 0 or notional != notional:  # NaN guard
-            return 0.0
-        return notional * self.rate
+        # ``NaN > 0`` is false, so missing notionals are fee-free as well.
+        return notional * self.rate if notional > 0 else 0.0
+
+    def fee_for_array(self, notionals: np.ndarray) -> np.ndarray:
+        """Vectorised :meth:`fee_for_notional` over an array of notionals."""
+
+        notionals = np.asarray(notionals, dtype=np.float64)
+        return np.where(notionals > 0, notionals * self.rate, 0.0)
 
     def round_trip_fees(self, buy_notional: float, sell_notional: float) -> float:
         """Compute the total fees for a round trip trade."""
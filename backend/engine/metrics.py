@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Dict
+import math
+from typing import Dict, Optional
 
 import numpy as np
 import pandas as pd
@@ -13,22 +14,42 @@ def compute_performance_metrics(
     drawdown: pd.Series,
     annualisation_factor: int = 252,
 ) -> Dict[str, float]:
-    metrics: Dict[str, float] = {}
     if equity is None or equity.empty:
-        return metrics
-
-    equity = equity.sort_index()
-    returns = equity.pct_change().dropna()
-    if not returns.empty:
-        avg_daily = returns.mean()
-        vol_daily = returns.std(ddof=0)
-        metrics["avg_daily_return"] = float(avg_daily)
-        metrics["volatility_daily"] = float(vol_daily)
-        metrics["annualized_return"] = float(((1.0 + avg_daily) ** annualisation_factor) - 1.0)
-        metrics["annualized_vol"] = float(vol_daily * np.sqrt(annualisation_factor))
-        if vol_daily > 0:
-            metrics["sharpe"] = float((avg_daily / vol_daily) * np.sqrt(annualisation_factor))
+        return {}
+
+    if not equity.index.is_monotonic_increasing:
+        equity = equity.sort_index()
+    drawdown_values = None
     if drawdown is not None and not drawdown.empty:
-        metrics["max_drawdown"] = float(drawdown.min())
-    metrics["ending_equity"] = float(equity.iloc[-1])
+        drawdown_values = drawdown.to_numpy(dtype=np.float64)
+    return _metrics_from_arrays(equity.to_numpy(dtype=np.float64), drawdown_values, annualisation_factor)
+
+
+def _metrics_from_arrays(
+    values: np.ndarray,
+    drawdown_values: Optional[np.ndarray],
+    annualisation_factor: int,
+) -> Dict[str, float]:
+    """Metrics for date-ordered, non-empty equity ``values``."""
+
+    metrics: Dict[str, float] = {}
+    # Zero or near-zero equity yields inf/NaN returns; pandas computed those
+    # silently, and numpy power saturates to inf where math.pow would raise.
+    with np.errstate(all="ignore"):
+        returns = values[1:] / values[:-1] - 1.0
+        returns = returns[~np.isnan(returns)]
+        if returns.size:
+            avg_daily = float(returns.mean())
+            vol_daily = float(returns.std(ddof=0))
+            metrics["avg_daily_return"] = avg_daily
+            metrics["volatility_daily"] = vol_daily
+            metrics["annualized_return"] = float(np.float64(1.0 + avg_daily) ** annualisation_factor - 1.0)
+            metrics["annualized_vol"] = vol_daily * math.sqrt(annualisation_factor)
+            if vol_daily > 0:
+                metrics["sharpe"] = (avg_daily / vol_daily) * math.sqrt(annualisation_factor)
+    if drawdown_values is not None:
+        drawdown_values = drawdown_values[~np.isnan(drawdown_values)]
+        if drawdown_values.size:
+            metrics["max_drawdown"] = float(drawdown_values.min())
+    metrics["ending_equity"] = float(values[-1])
     return metrics
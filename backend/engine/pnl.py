@@ -3,49 +3,174 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from ._njit import njit
+from .metrics import _metrics_from_arrays
+
 logger = logging.getLogger(__name__)
 
+# Empty results are shallow copies of this template: cheaper than building a
+# Series from scratch, and callers still get an object of their own.
+_EMPTY_SERIES = pd.Series(dtype=float)
+
+
+@njit("Tuple((int64[:], float64[:]))(int64[:], float64[:])", cache=True)
+def _sum_sorted_runs(keys: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Sum ``values`` over contiguous runs of equal, pre-sorted ``keys``."""
+
+    n = keys.size
+    out_keys = np.empty(n, dtype=keys.dtype)
+    out_sums = np.empty(n, dtype=np.float64)
+    groups = 0
+    for i in range(n):
+        if groups == 0 or keys[i] != out_keys[groups - 1]:
+            out_keys[groups] = keys[i]
+            out_sums[groups] = 0.0
+            groups += 1
+        out_sums[groups - 1] += values[i]
+    return out_keys[:groups], out_sums[:groups]
+
+
+# ``error_model="numpy"`` keeps IEEE division semantics in the drawdown
+# kernels: a zero peak yields NaN/-inf, as ``equity / equity.cummax() - 1``
+# does, instead of raising ZeroDivisionError.
+@njit("float64[:](float64[:])", cache=True, error_model="numpy")
+def _drawdown_kernel(equity: np.ndarray) -> np.ndarray:
+    """Single pass over ``equity`` tracking the running peak; NaNs are skipped."""
+
+    out = np.empty_like(equity)
+    peak = -np.inf
+    for i in range(equity.size):
+        value = equity[i]
+        if np.isnan(value):
+            out[i] = np.nan
+            continue
+        if value > peak:
+            peak = value
+        out[i] = value / peak - 1.0
+    return out
+
+
+@njit("Tuple((float64[:], float64[:]))(float64[:], float64)", cache=True, error_model="numpy")
+def _equity_drawdown_kernel(daily_pnl: np.ndarray, initial_capital: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Equity after each day's PnL and its drawdown, in one pass.
+
+    Matches ``initial_capital + np.cumsum(daily_pnl)`` followed by
+    ``_drawdown_kernel``.
+    """
+
+    n = daily_pnl.size
+    equity = np.empty(n)
+    drawdown = np.empty(n)
+    total = 0.0
+    peak = -np.inf
+    for i in range(n):
+        total += daily_pnl[i]
+        value = initial_capital + total
+        equity[i] = value
+        if np.isnan(value):
+            drawdown[i] = np.nan
+            continue
+        if value > peak:
+            peak = value
+        drawdown[i] = value / peak - 1.0
+    return equity, drawdown
 
-def build_equity_curve(trades: pd.DataFrame, initial_capital: float, column: str = "net_pnl") -> pd.Series:
-    """Build an equity curve from realised trade PnL."""
 
-    if trades is None or trades.empty:
-        return pd.Series(dtype=float)
+def _daily_pnl(trades: pd.DataFrame, column: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Return sorted distinct exit dates (int64 ns) and the PnL realised on each."""
+
     if column not in trades.columns:
         raise KeyError(f"Column '{column}' not found in trades DataFrame")
-    pnl = trades.groupby("exit_date")[column].sum().sort_index()
-    if pnl.empty:
-        return pd.Series(dtype=float)
-    equity = float(initial_capital) + pnl.cumsum()
-    equity.index = pd.to_datetime(equity.index)
-    equity.name = "equity"
-    return equity
+    exit_ns = pd.DatetimeIndex(trades["exit_date"]).asi8
+    values = trades[column].to_numpy(dtype=np.float64)
+    # Only missing PnL counts as zero (as groupby().sum() skips it); +/-inf stays.
+    values = np.where(np.isnan(values), 0.0, values)
+    valid = exit_ns != pd.NaT.value
+    if not valid.all():
+        exit_ns, values = exit_ns[valid], values[valid]
+    order = np.argsort(exit_ns, kind="stable")
+    exit_ns, values = exit_ns[order], values[order]
+    if exit_ns.size < 2 or (exit_ns[1:] != exit_ns[:-1]).all():
+        # One trade per exit date: nothing to aggregate. Adding 0.0 matches
+        # the run sums, which start from 0.0 (so -0.0 becomes 0.0).
+        return exit_ns, values + 0.0
+    return _sum_sorted_runs(exit_ns, values)
+
+
+def _equity_arrays(trades: pd.DataFrame, initial_capital: float, column: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Return sorted distinct exit dates (int64 ns) and the equity after each."""
+
+    dates, pnl = _daily_pnl(trades, column)
+    return dates, float(initial_capital) + np.cumsum(pnl)
+
+
+def build_equity_curve(trades: pd.DataFrame, initial_capital: float, column: str = "net_pnl") -> pd.Series:
+    """Build an equity curve from realised trade PnL."""
+
+    if trades is None or len(trades.index) == 0:
+        return _EMPTY_SERIES.copy(deep=False)
+    dates, equity = _equity_arrays(trades, initial_capital, column)
+    if dates.size == 0:
+        return _EMPTY_SERIES.copy(deep=False)
+    return pd.Series(equity, index=pd.DatetimeIndex(dates.view("datetime64[ns]"), name="exit_date"), name="equity")
 
 
 def compute_drawdown(equity: pd.Series) -> pd.Series:
     """Compute percentage drawdown from an equity curve."""
 
     if equity is None or equity.empty:
-        return pd.Series(dtype=float)
-    running_max = equity.cummax()
-    drawdown = equity / running_max - 1.0
-    drawdown.name = "drawdown"
-    return drawdown
+        return _EMPTY_SERIES.copy(deep=False)
+    with np.errstate(divide="ignore", invalid="ignore"):  # pure-Python fallback
+        values = _drawdown_kernel(equity.to_numpy(dtype=np.float64))
+    return pd.Series(values, index=equity.index, name="drawdown")
+
+
+def build_curves_and_metrics(
+    trades: pd.DataFrame,
+    initial_capital: float,
+    column: str = "net_pnl",
+    annualisation_factor: int = 252,
+) -> Tuple[pd.Series, pd.Series, Dict[str, float]]:
+    """Return the equity curve, its drawdown and the performance metrics.
+
+    Same results as ``build_equity_curve`` -> ``compute_drawdown`` ->
+    ``compute_performance_metrics``, but equity and drawdown come out of one
+    fused pass and all three work on plain arrays instead of round-tripping
+    through Series.
+    """
+
+    if trades is None or len(trades.index) == 0:
+        return _EMPTY_SERIES.copy(deep=False), _EMPTY_SERIES.copy(deep=False), {}
+    dates, pnl = _daily_pnl(trades, column)
+    if dates.size == 0:
+        return _EMPTY_SERIES.copy(deep=False), _EMPTY_SERIES.copy(deep=False), {}
+    with np.errstate(divide="ignore", invalid="ignore"):  # pure-Python fallback
+        equity_values, drawdown_values = _equity_drawdown_kernel(pnl, float(initial_capital))
+    index = pd.DatetimeIndex(dates.view("datetime64[ns]"), name="exit_date")
+    equity = pd.Series(equity_values, index=index, name="equity")
+    drawdown = pd.Series(drawdown_values, index=index, name="drawdown")
+    return equity, drawdown, _metrics_from_arrays(equity_values, drawdown_values, annualisation_factor)
 
 
 def warn_if_returns_constant(trades: pd.DataFrame, threshold: float = 0.5) -> Optional[float]:
     """Emit a warning if distinct returns fall below the configured ratio."""
 
-    if trades is None or trades.empty or "net_return" not in trades.columns:
+    count = 0 if trades is None else len(trades.index)
+    if count == 0 or "net_return" not in trades.columns:
         return None
-    distinct = trades["net_return"].round(8).nunique()
-    ratio = distinct / float(len(trades)) if len(trades) else 0.0
-    if ratio < threshold:
-        logger.warning(
-            "Trade returns show low variability", extra={"distinct_ratio": ratio, "trade_count": len(trades)}
-        )
+    # Distinct returns at 1e-8 resolution, as ``round(8).nunique()`` counts
+    # them, via integer ticks; missing returns are not counted.
+    values = trades["net_return"].to_numpy(dtype=np.float64)
+    finite = np.isfinite(values)
+    distinct = np.unique(np.rint(values[finite] * 1e8).astype(np.int64)).size
+    if not finite.all():
+        distinct += np.unique(values[np.isinf(values)]).size
+    ratio = distinct / float(count)
+    if ratio < threshold and logger.isEnabledFor(logging.WARNING):
+        logger.warning("Trade returns show low variability", extra={"distinct_ratio": ratio, "trade_count": count})
     return ratio
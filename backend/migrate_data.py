@@ -0,0 +1,107 @@
+"""One-shot migration for the feather bundle consumed by the API server.
+
+Older bundles were written by ``data_pipeline.py`` with pandas' default
+feather settings (LZ4).  This script rewrites every ``*_wide.feather`` file in
+place as Feather v2 with Zstandard compression, which is noticeably smaller on
+disk for the same read path::
+
+    python migrate_data.py --data-dir ../data
+
+Files are read and written through ``pyarrow.feather`` so the Arrow schema
+(including the ``timestamp[ns]`` date column) is preserved unchanged.
+
+``sp500_metadata.feather`` is rewritten the same way, and its legacy
+``symbol`` column is renamed to ``ticker`` to match what the API reads.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+DEFAULT_COMPRESSION = "zstd"
+DEFAULT_COMPRESSION_LEVEL = 3
+METADATA_FILE = "sp500_metadata.feather"
+METADATA_RENAMES = {"symbol": "ticker"}
+
+
+def recompress_feather(
+    path: Path,
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+) -> None:
+    """Rewrite a single feather file with the requested compression."""
+    table = feather.read_table(str(path))
+    _write_feather(table, path, compression=compression, compression_level=compression_level)
+
+
+def migrate_metadata(
+    path: Path,
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+) -> None:
+    """Rename legacy metadata columns and rewrite the file with the requested compression."""
+    table = feather.read_table(str(path))
+    if any(name in METADATA_RENAMES for name in table.column_names):
+        table = table.rename_columns([METADATA_RENAMES.get(name, name) for name in table.column_names])
+        # The stored pandas metadata still names the old columns; drop it so
+        # readers rebuild the frame from the Arrow schema alone.
+        table = table.replace_schema_metadata(None)
+    _write_feather(table, path, compression=compression, compression_level=compression_level)
+
+
+def _write_feather(
+    table: pa.Table,
+    path: Path,
+    compression: str,
+    compression_level: Optional[int],
+) -> None:
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    feather.write_feather(table, str(tmp_path), compression=compression, compression_level=compression_level)
+    tmp_path.replace(path)
+
+
+def migrate_data_dir(
+    data_dir: Path,
+    compression: str = DEFAULT_COMPRESSION,
+    compression_level: Optional[int] = DEFAULT_COMPRESSION_LEVEL,
+) -> List[Path]:
+    """Recompress every wide table (and the metadata file) in ``data_dir`` and return the touched paths."""
+    paths = sorted(data_dir.glob("*_wide.feather"))
+    if not paths:
+        raise FileNotFoundError(f"No *_wide.feather files found in {data_dir}")
+    for path in paths:
+        before = path.stat().st_size
+        recompress_feather(path, compression=compression, compression_level=compression_level)
+        after = path.stat().st_size
+        print(f"Rewrote {path.name}: {before:,} -> {after:,} bytes", file=sys.stderr)
+    meta_path = data_dir / METADATA_FILE
+    if meta_path.exists():
+        migrate_metadata(meta_path, compression=compression, compression_level=compression_level)
+        print(f"Rewrote {meta_path.name}", file=sys.stderr)
+        paths.append(meta_path)
+    return paths
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recompress the feather data bundle")
+    parser.add_argument("--data-dir", default="data", type=Path, help="Directory containing *_wide.feather files")
+    parser.add_argument("--compression", default=DEFAULT_COMPRESSION, help="Feather compression codec")
+    parser.add_argument(
+        "--compression-level", default=DEFAULT_COMPRESSION_LEVEL, type=int, help="Codec-specific compression level"
+    )
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    migrate_data_dir(
+        data_dir=args.data_dir,
+        compression=args.compression,
+        compression_level=args.compression_level,
+    )
@@ -2,35 +2,90 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 
+def format_dates(values: Any) -> List[Optional[str]]:
+    """Format datetimes as ``YYYY-MM-DD``, formatting each distinct day once.
+
+    Shared by every payload that carries dates; NaT becomes ``None`` (null).
+    """
+
+    codes, uniques = pd.factorize(pd.DatetimeIndex(values))
+    # A trailing ``None`` makes the missing-value code (-1) map to null.
+    formatted = np.append(np.asarray(uniques.strftime("%Y-%m-%d"), dtype=object), None)
+    return formatted[codes].tolist()
+
+
 def serialise_trades(trades: pd.DataFrame) -> List[Dict[str, Any]]:
     """Return trade dictionaries suitable for JSON responses."""
 
     if trades is None or trades.empty:
         return []
 
-    payload: List[Dict[str, Any]] = []
-    for row in trades.itertuples():
-        payload.append(
-            {
-                "enter_date": row.enter_date.strftime("%Y-%m-%d"),
-                "exit_date": row.exit_date.strftime("%Y-%m-%d"),
-                "enter_price": float(row.enter_price),
-                "exit_price": float(row.exit_price),
-                "pnl": float(row.net_pnl),
-                "ret": float(row.net_return),
-                "symbol": getattr(row, "symbol", None),
-                "gross_pnl": float(row.gross_pnl),
-                "fees": float(row.fees),
-                "side": getattr(row, "side", "long"),
-                "quantity": float(row.quantity),
-                "notional": float(row.notional),
-                "buy_fee": float(row.buy_fee),
-                "sell_fee": float(row.sell_fee),
-            }
-        )
-    return payload
+    enter_dates = format_dates(trades["enter_date"])
+    exit_dates = format_dates(trades["exit_date"])
+
+    def floats(column: str) -> List[float]:
+        return trades[column].to_numpy(dtype=np.float64).tolist()
+
+    def objects(column: str, default: Any) -> List[Any]:
+        if column in trades.columns:
+            return trades[column].to_numpy(dtype=object).tolist()
+        return [default] * len(trades)
+
+    # Each column is converted to Python values once; rows are then zipped
+    # together without building a row object per trade.
+    columns = zip(
+        enter_dates,
+        exit_dates,
+        floats("enter_price"),
+        floats("exit_price"),
+        floats("net_pnl"),
+        floats("net_return"),
+        objects("symbol", None),
+        floats("gross_pnl"),
+        floats("fees"),
+        objects("side", "long"),
+        floats("quantity"),
+        floats("notional"),
+        floats("buy_fee"),
+        floats("sell_fee"),
+    )
+    return [
+        {
+            "enter_date": enter_date,
+            "exit_date": exit_date,
+            "enter_price": enter_price,
+            "exit_price": exit_price,
+            "pnl": pnl,
+            "ret": ret,
+            "symbol": symbol,
+            "gross_pnl": gross_pnl,
+            "fees": fees,
+            "side": side,
+            "quantity": quantity,
+            "notional": notional,
+            "buy_fee": buy_fee,
+            "sell_fee": sell_fee,
+        }
+        for (
+            enter_date,
+            exit_date,
+            enter_price,
+            exit_price,
+            pnl,
+            ret,
+            symbol,
+            gross_pnl,
+            fees,
+            side,
+            quantity,
+            notional,
+            buy_fee,
+            sell_fee,
+        ) in columns
+    ]
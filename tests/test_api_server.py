@@ -0,0 +1,66 @@
+import gzip
+
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from backend import api_server
+
+PAYLOAD = {
+    "strategy": "rsi",
+    "indicators": {"rsi": {"use": True, "rule": "oversold", "oversold": 40}},
+    "universe": ["MSFT", "JPM", "XOM"],
+    "start": "2023-01-02",
+    "end": "2023-12-29",
+    "hold_days": 3,
+}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv("BACKTEST_WORKERS", "1")
+        api_server._backtest_executor.cache_clear()
+        with TestClient(api_server.app) as test_client:
+            yield test_client
+        api_server._backtest_executor().shutdown()
+        api_server._backtest_executor.cache_clear()
+
+
+def _post_raw(client, payload, accept_encoding):
+    """POST ``payload`` and return the response with its undecoded body."""
+
+    with client.stream("POST", "/run_backtest", json=payload, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_gzip_request_is_compressed_exactly_once(client):
+    response, raw = _post_raw(client, PAYLOAD, "gzip, deflate")
+
+    assert response.status_code == 200
+    assert response.headers.get_list("content-encoding") == ["gzip"]
+    assert response.headers["content-length"] == str(len(raw))
+    assert "Accept-Encoding" in response.headers["vary"]
+    # One decompression yields the JSON document, so GZipMiddleware did not
+    # compress the already-encoded body a second time.
+    body = orjson.loads(gzip.decompress(raw))
+    assert body["trades"]
+
+
+def test_non_gzip_request_is_served_plain(client):
+    response, raw = _post_raw(client, PAYLOAD, "identity")
+    _, compressed = _post_raw(client, PAYLOAD, "gzip")
+
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(len(raw))
+    assert orjson.loads(raw) == orjson.loads(gzip.decompress(compressed))
+
+
+@pytest.mark.parametrize("field", ["start", "end"])
+@pytest.mark.parametrize("value", ["2023-02-30", "2023-13-01", "not-a-date", "0001-01-01"])
+def test_malformed_dates_are_rejected(client, field, value):
+    response = client.post("/run_backtest", json={**PAYLOAD, field: value})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": f"Invalid date: {value}"}
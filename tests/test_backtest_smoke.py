@@ -1,7 +1,10 @@
 import math
 
+import numpy as np
 import pandas as pd
+import pytest
 
+from backend import backtest_system
 from backend.engine import (
     FeeModel,
     TradeBuilderConfig,
@@ -69,3 +72,149 @@ def test_smoke_backtest_behaviour():
     total_fees = trades["fees"].sum()
     gross_profit = trades["gross_pnl"].sum()
     assert abs(total_fees) < 0.1 * (abs(gross_profit) + 1e-6)
+
+
+def test_adx_signals_fire_on_date_indexed_wide_tables():
+    # A steady uptrend keeps the ADX well above its 20 threshold once warmed up.
+    dates = pd.bdate_range("2023-01-02", periods=80)
+    close = 50.0 + np.arange(80) * 0.5 + np.sin(np.arange(80)) * 0.3
+    high, low = close + 0.4, close - 0.4
+
+    def wide(values):
+        return pd.DataFrame({"date": dates, "AAA": values})
+
+    result = backtest_system.run_backtest_for_all(
+        wide(close), wide(high), wide(low), wide(close), None, config={"use_adx": True}, max_horizon=5
+    )
+    picks = result["picks"]
+
+    _, signal = backtest_system.calculate_adx(high, low, close)
+    expected = dates[signal.to_numpy()]
+    assert len(expected) > 0
+    # The final day has no forward return, so it cannot become a pick.
+    assert list(picks["date"]) == list(expected[expected < dates[-1]])
+    assert set(picks["triggered_signals"]) == {"ADX"}
+
+
+def _indicator_inputs(length: int, gaps: bool) -> pd.DataFrame:
+    # Prices rounded to whole units so rolling highs and lows tie often.
+    rng = np.random.default_rng(length)
+    close = np.round(50.0 + np.cumsum(rng.normal(0.0, 1.0, length)))
+    frame = pd.DataFrame(
+        {
+            "close": close,
+            "high": close + rng.integers(0, 3, length),
+            "low": close - rng.integers(0, 3, length),
+            "volume": rng.integers(1, 5, length) * 100.0,
+        }
+    )
+    if gaps:
+        frame.iloc[3:5] = np.nan
+        frame.iloc[length // 2, :3] = np.nan
+    return frame
+
+
+INDICATOR_CASES = [
+    pytest.param(length, window, gaps, id=f"len{length}-w{window}-{'gaps' if gaps else 'dense'}")
+    for length, window in [(40, 1), (40, 5), (40, 14), (12, 12), (8, 20)]
+    for gaps in (False, True)
+]
+
+
+def _assert_same(actual, expected):
+    np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("length, window, gaps", INDICATOR_CASES)
+def test_rolling_helpers_match_pandas(length, window, gaps):
+    values = _indicator_inputs(length, gaps)["close"]
+    rolling = values.rolling(window, min_periods=window)
+    arr = values.to_numpy()
+
+    _assert_same(backtest_system._rolling_sum(arr, window), rolling.sum())
+    _assert_same(backtest_system._rolling_extreme(arr, window, np.min), rolling.min())
+    _assert_same(backtest_system._rolling_extreme(arr, window, np.max), rolling.max())
+
+
+@pytest.mark.parametrize("length, window, gaps", INDICATOR_CASES)
+def test_aroon_matches_pandas_reference(length, window, gaps):
+    frame = _indicator_inputs(length, gaps)
+    high, low = frame["high"], frame["low"]
+    # Reference: the earliest highest high / lowest low of each window by idxmax/idxmin.
+    expected_up = pd.Series(np.nan, index=high.index)
+    expected_down = pd.Series(np.nan, index=high.index)
+    for i in range(window - 1, length):
+        high_window, low_window = high.iloc[i - window + 1:i + 1], low.iloc[i - window + 1:i + 1]
+        hh_dist = i - high_window.idxmax() if high_window.notna().any() else np.nan
+        ll_dist = i - low_window.idxmin() if low_window.notna().any() else np.nan
+        expected_up.iloc[i] = 100.0 * (window - hh_dist) / window
+        expected_down.iloc[i] = 100.0 * (window - ll_dist) / window
+
+    up, down, signal = backtest_system._aroon_arrays(high.to_numpy(), low.to_numpy(), window, 70.0, 30.0)
+
+    _assert_same(up, expected_up)
+    _assert_same(down, expected_down)
+    np.testing.assert_array_equal(signal, (expected_up >= 70.0) & (expected_down <= 30.0))
+
+
+@pytest.mark.parametrize("signal_rule", ["signal", "oversold", "overbought"])
+@pytest.mark.parametrize("length, window, gaps", INDICATOR_CASES)
+def test_stochastic_matches_pandas_reference(length, window, gaps, signal_rule):
+    frame = _indicator_inputs(length, gaps)
+    lowest_low = frame["low"].rolling(window, min_periods=window).min()
+    highest_high = frame["high"].rolling(window, min_periods=window).max()
+    expected_k = 100.0 * (frame["close"] - lowest_low) / (highest_high - lowest_low)
+    expected_d = expected_k.rolling(3, min_periods=3).mean()
+    if signal_rule == "signal":
+        expected_signal = (expected_k.shift(1) < 20.0) & (expected_k >= 20.0)
+    elif signal_rule == "oversold":
+        expected_signal = expected_k < 20.0
+    else:
+        expected_signal = expected_k > 80.0
+
+    k, d, signal = backtest_system._stochastic_arrays(
+        frame["high"].to_numpy(), frame["low"].to_numpy(), frame["close"].to_numpy(), window, 3, signal_rule, 20.0
+    )
+
+    _assert_same(k, expected_k)
+    _assert_same(d, expected_d)
+    np.testing.assert_array_equal(signal, expected_signal)
+
+
+@pytest.mark.parametrize("rule", ["rise", "positive"])
+@pytest.mark.parametrize("length, gaps", [(40, False), (40, True), (8, False), (8, True)])
+def test_obv_matches_pandas_reference(length, gaps, rule):
+    frame = _indicator_inputs(length, gaps)
+    prices, volume = frame["close"], frame["volume"]
+    # Reference: signed volume by the direction of each move, NaN moves held flat.
+    moves = prices.diff()
+    steps = volume.where(moves > 0, -volume.where(moves < 0, 0.0))
+    steps.iloc[0] = volume.iloc[0]
+    expected_obv = steps.cumsum(skipna=False)
+    if rule == "rise":
+        ma = expected_obv.rolling(20, min_periods=20).mean()
+        expected_signal = (expected_obv.shift(1) < ma.shift(1)) & (expected_obv >= ma)
+    else:
+        expected_signal = expected_obv > 0
+
+    obv, signal = backtest_system._obv_arrays(prices.to_numpy(), volume.to_numpy(), rule)
+
+    _assert_same(obv, expected_obv)
+    np.testing.assert_array_equal(signal, expected_signal)
+
+
+@pytest.mark.parametrize("length, max_horizon", [(40, 5), (12, 12), (8, 20)])
+@pytest.mark.parametrize("gaps", [False, True])
+def test_forward_returns_match_pandas_reference(length, max_horizon, gaps):
+    prices = _indicator_inputs(length, gaps)["close"]
+    returns = np.log(prices).diff()
+    rows = np.arange(length)
+
+    actual = backtest_system._forward_returns_at(prices.to_numpy(), rows, max_horizon)
+
+    for h in range(1, max_horizon + 1):
+        expected = returns.shift(-h).rolling(window=h, min_periods=h).sum()
+        _assert_same(actual[:, h - 1], expected)
+    # A subset of rows reads the same values as the full table.
+    subset = rows[::3]
+    _assert_same(backtest_system._forward_returns_at(prices.to_numpy(), subset, max_horizon), actual[subset])
@@ -0,0 +1,201 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.engine import FeeModel, TradeBuilderConfig, build_trades_from_picks
+from backend.engine.execution import (
+    _ENTRY,
+    _EXECUTED,
+    _NO_CASH,
+    _NO_SLOTS,
+    _NOT_OPEN,
+    _event_schedule,
+    _prepare_candidates,
+    _simulate_events,
+)
+
+
+def _reference_replay(enter, exit_, enter_px, exit_px, fee_rate, capital, max_active=None, compound=True):
+    """The original dict-based replay loop, kept as the oracle for the kernel."""
+
+    events = []
+    for idx in range(len(enter)):
+        events.append((enter[idx], "entry", idx))
+        events.append((exit_[idx], "exit", idx))
+    events.sort(key=lambda item: (item[0], 0 if item[1] == "exit" else 1))
+    if max_active is None:
+        active = max_active = 0
+        for _, event_type, _ in events:
+            active += 1 if event_type == "entry" else -1
+            max_active = max(max_active, active)
+        max_active = max(1, max_active)
+
+    def fee(notional):
+        return notional * fee_rate if notional > 0 else 0.0
+
+    cash = capital
+    open_positions = {}
+    ledger, rejected = [], []
+    for ts, event_type, idx in events:
+        if event_type == "entry":
+            available_slots = max_active - len(open_positions)
+            if available_slots <= 0:
+                rejected.append((idx, _NO_SLOTS))
+                continue
+            allocation_base = cash / available_slots if compound else capital / max_active
+            allocation = min(allocation_base, cash)
+            if allocation <= 0:
+                rejected.append((idx, _NO_CASH))
+                continue
+            quantity = allocation / (enter_px[idx] * (1.0 + fee_rate))
+            notional = enter_px[idx] * quantity
+            buy_fee = fee(notional)
+            cash -= notional + buy_fee
+            open_positions[idx] = (quantity, notional, buy_fee)
+            pnl, fee_paid, side = 0.0, buy_fee, "buy"
+        else:
+            position = open_positions.pop(idx, None)
+            if position is None:
+                continue
+            quantity, buy_notional, buy_fee = position
+            notional = exit_px[idx] * quantity
+            fee_paid = fee(notional)
+            cash += notional - fee_paid
+            pnl = notional - buy_notional - (buy_fee + fee_paid)
+            side = "sell"
+        equity = cash + sum(position[1] for position in open_positions.values())
+        ledger.append((pd.Timestamp(ts), side, idx, quantity, notional, fee_paid, pnl, cash, equity))
+    return ledger, rejected
+
+
+def _kernel_replay(enter, exit_, enter_px, exit_px, fee_rate, capital, max_active, compound=True):
+    ids, kinds, stamps = _event_schedule(enter, exit_)
+    status, values, _ = _simulate_events(kinds, ids, enter_px, exit_px, fee_rate, capital, max_active, compound)
+    ledger = [
+        (pd.Timestamp(stamps[e]), "buy" if kinds[e] == _ENTRY else "sell", ids[e], *values[e, :6])
+        for e in np.flatnonzero(status == _EXECUTED)
+    ]
+    rejected = [(ids[e], status[e]) for e in np.flatnonzero((status != _EXECUTED) & (status != _NOT_OPEN))]
+    return ledger, rejected
+
+
+def _dates(*days, tz=None):
+    return pd.DatetimeIndex(list(days), tz=tz)
+
+
+def _assert_same_replay(actual, expected):
+    (ledger, rejected), (expected_ledger, expected_rejected) = actual, expected
+    assert rejected == expected_rejected
+    assert [row[:3] for row in ledger] == [row[:3] for row in expected_ledger]
+    assert [row[3:] for row in ledger] == [pytest.approx(row[3:], rel=1e-12) for row in expected_ledger]
+
+
+def test_simple_interest_ledger_matches_reference_with_same_day_exits_and_entries():
+    # Two picks a day held for two days, so every exit shares a day with entries.
+    days = pd.bdate_range("2023-03-01", periods=6)
+    picks = pd.DataFrame(
+        {
+            "symbol": [f"S{i % 3}" for i in range(12)],
+            "date": days.repeat(2),
+            "adj_close": [50.0 + 3 * i for i in range(12)],
+            "fwd_ret_2d": [math.log1p(r) for r in np.tile([0.04, -0.03, 0.01, -0.02], 3)],
+        }
+    )
+    config = TradeBuilderConfig(hold_days=2, fee_model=FeeModel(10.0), initial_capital=10_000.0, compound=False)
+
+    result = build_trades_from_picks(picks, config)
+
+    candidates = _prepare_candidates(picks, 2, None, None)
+    expected, rejected = _reference_replay(
+        candidates["enter_date"].to_numpy(),
+        candidates["exit_date"].to_numpy(),
+        candidates["enter_price"].to_numpy(),
+        candidates["exit_price"].to_numpy(),
+        config.fee_model.rate,
+        config.initial_capital,
+        compound=False,
+    )
+    assert rejected == []
+    ledger = result.ledger
+    assert list(zip(ledger["ts"], ledger["event"])) == [row[:2] for row in expected]
+    actual = ledger[["quantity", "notional", "fee", "pnl", "cash", "equity"]].to_numpy().tolist()
+    assert actual == [pytest.approx(row[3:], rel=1e-12) for row in expected]
+    # Each same-day exit is booked before that day's entries.
+    same_day = ledger.groupby("ts")["event"].agg(list)
+    assert all(events == sorted(events, key=lambda e: e != "sell") for events in same_day)
+
+
+def test_entries_beyond_the_slot_limit_are_skipped():
+    enter = _dates("2023-01-02", "2023-01-02", "2023-01-03", "2023-01-05")
+    exit_ = _dates("2023-01-04", "2023-01-04", "2023-01-05", "2023-01-06")
+    enter_px = np.array([10.0, 20.0, 30.0, 40.0])
+    exit_px = np.array([11.0, 19.0, 33.0, 38.0])
+
+    actual = _kernel_replay(enter, exit_, enter_px, exit_px, 0.001, 1_000.0, max_active=1)
+
+    expected = _reference_replay(enter, exit_, enter_px, exit_px, 0.001, 1_000.0, max_active=1)
+    assert expected[1] == [(1, _NO_SLOTS), (2, _NO_SLOTS)]
+    _assert_same_replay(actual, expected)
+
+
+def test_entry_is_rejected_when_cash_is_exhausted():
+    # A 100% fee rate makes exits return nothing, so the freed slot has no cash.
+    enter = _dates("2023-01-02", "2023-01-02", "2023-01-03")
+    exit_ = _dates("2023-01-03", "2023-01-04", "2023-01-04")
+    prices = np.ones(3)
+
+    actual = _kernel_replay(enter, exit_, prices, prices, 1.0, 1_000.0, max_active=2)
+
+    expected = _reference_replay(enter, exit_, prices, prices, 1.0, 1_000.0, max_active=2)
+    assert expected[1] == [(2, _NO_CASH)]
+    _assert_same_replay(actual, expected)
+
+
+def test_unsorted_candidates_replay_in_time_order():
+    rng = np.random.default_rng(7)
+    days = pd.bdate_range("2023-01-02", periods=15)
+    starts = rng.integers(0, 10, 25)
+    enter = days[starts]
+    exit_ = days[starts + rng.integers(1, 5, 25)]
+    enter_px = rng.uniform(10.0, 100.0, 25)
+    exit_px = enter_px * rng.uniform(0.9, 1.1, 25)
+
+    for compound in (True, False):
+        actual = _kernel_replay(enter, exit_, enter_px, exit_px, 0.0005, 5_000.0, max_active=4, compound=compound)
+        expected = _reference_replay(enter, exit_, enter_px, exit_px, 0.0005, 5_000.0, 4, compound)
+        assert any(reason == _NO_SLOTS for _, reason in expected[1])
+        _assert_same_replay(actual, expected)
+
+
+def test_tz_aware_picks_match_reference():
+    days = pd.bdate_range("2023-03-01", periods=5, tz="UTC")
+    picks = pd.DataFrame(
+        {
+            "symbol": [f"S{i % 3}" for i in range(10)],
+            "date": days.repeat(2),
+            "adj_close": [50.0 + i for i in range(10)],
+            "fwd_ret_2d": [math.log1p(r) for r in np.tile([0.03, -0.02], 5)],
+        }
+    )
+    config = TradeBuilderConfig(hold_days=2, fee_model=FeeModel(5.0), initial_capital=1_000.0)
+
+    result = build_trades_from_picks(picks, config)
+
+    candidates = _prepare_candidates(picks, 2, None, None)
+    expected, _ = _reference_replay(
+        pd.DatetimeIndex(candidates["enter_date"]),
+        pd.DatetimeIndex(candidates["exit_date"]),
+        candidates["enter_price"].to_numpy(),
+        candidates["exit_price"].to_numpy(),
+        config.fee_model.rate,
+        config.initial_capital,
+    )
+    ledger = result.ledger
+    assert str(ledger["ts"].dtype) == "datetime64[ns, UTC]"
+    assert list(zip(ledger["ts"], ledger["event"])) == [row[:2] for row in expected]
+    actual = ledger[["quantity", "notional", "fee", "pnl", "cash", "equity"]].to_numpy().tolist()
+    assert actual == [pytest.approx(row[3:], rel=1e-12) for row in expected]
+    assert len(result.trades) == 10
+    assert str(result.trades["enter_date"].dtype) == "datetime64[ns, UTC]"
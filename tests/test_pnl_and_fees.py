@@ -3,7 +3,15 @@ import math
 import pandas as pd
 import pytest
 
-from backend.engine import FeeModel, TradeBuilderConfig, build_trades_from_picks
+from backend.engine import (
+    FeeModel,
+    TradeBuilderConfig,
+    build_curves_and_metrics,
+    build_equity_curve,
+    build_trades_from_picks,
+    compute_drawdown,
+    compute_performance_metrics,
+)
 
 
 def _make_pick(symbol: str, date: str, price: float, simple_return: float, hold_days: int) -> dict:
@@ -63,3 +71,84 @@ def test_trade_financials_match_hand_calculation():
         assert row.gross_pnl == pytest.approx(gross_pnl, rel=1e-6)
         assert row.net_pnl == pytest.approx(net_pnl, rel=1e-6)
         assert row.net_return == pytest.approx(expected_return, rel=1e-6)
+
+
+def test_fee_for_array_matches_scalar_fee():
+    fee_model = FeeModel(5.0)
+    notionals = [1_000.0, 0.0, -50.0, float("nan"), 12.5]
+    fees = fee_model.fee_for_array(notionals)
+    assert fees.tolist() == [fee_model.fee_for_notional(n) for n in notionals]
+
+
+def test_equity_curve_sums_trades_closing_on_same_day():
+    trades = pd.DataFrame(
+        {
+            "exit_date": pd.to_datetime(["2023-01-05", "2023-01-03", "2023-01-05", "2023-01-04"]),
+            "net_pnl": [10.0, -5.0, 2.5, 1.0],
+        }
+    )
+
+    equity = build_equity_curve(trades, initial_capital=1_000.0)
+
+    assert list(equity.index) == list(pd.to_datetime(["2023-01-03", "2023-01-04", "2023-01-05"]))
+    assert equity.tolist() == pytest.approx([995.0, 996.0, 1_008.5])
+    assert equity.name == "equity"
+
+
+@pytest.mark.parametrize(
+    "net_pnl",
+    [
+        [10.0, -5.0, 2.5, -20.0, 7.0],
+        # Equity is wiped out on 2023-01-03 and goes negative on 2023-01-04.
+        [10.0, -1_000.0, 2.5, -20.0, 7.0],
+    ],
+)
+def test_fused_curves_match_separate_helpers(net_pnl):
+    trades = pd.DataFrame(
+        {
+            "exit_date": pd.to_datetime(["2023-01-05", "2023-01-03", "2023-01-05", "2023-01-04", "2023-01-09"]),
+            "net_pnl": net_pnl,
+        }
+    )
+
+    equity, drawdown, metrics = build_curves_and_metrics(trades, initial_capital=1_000.0)
+
+    expected_equity = build_equity_curve(trades, initial_capital=1_000.0)
+    expected_drawdown = compute_drawdown(expected_equity)
+    pd.testing.assert_series_equal(equity, expected_equity)
+    pd.testing.assert_series_equal(drawdown, expected_drawdown)
+    assert metrics == pytest.approx(compute_performance_metrics(expected_equity, expected_drawdown), nan_ok=True)
+
+
+def test_metrics_saturate_when_equity_nearly_wiped_out():
+    equity = pd.Series([1_000.0, 0.001, 500.0], index=pd.bdate_range("2023-01-02", periods=3))
+
+    metrics = compute_performance_metrics(equity, compute_drawdown(equity))
+
+    assert metrics["annualized_return"] == math.inf
+    assert metrics["ending_equity"] == 500.0
+
+
+def test_drawdown_of_zero_and_negative_equity_matches_pandas():
+    equity = pd.Series([0.0, -1.0, 2.0, 0.0], index=pd.bdate_range("2023-01-02", periods=4))
+
+    drawdown = compute_drawdown(equity)
+
+    expected = (equity / equity.cummax() - 1.0).rename("drawdown")
+    pd.testing.assert_series_equal(drawdown, expected)
+
+
+def test_infinite_pnl_stays_infinite_while_missing_pnl_counts_as_zero():
+    trades = pd.DataFrame(
+        {
+            "exit_date": pd.to_datetime(["2023-01-03", "2023-01-04", "2023-01-04", "2023-01-05"]),
+            "net_pnl": [5.0, math.inf, float("nan"), -2.0],
+        }
+    )
+
+    equity = build_equity_curve(trades, initial_capital=1_000.0)
+    fused_equity, _, metrics = build_curves_and_metrics(trades, initial_capital=1_000.0)
+
+    assert equity.tolist() == [1_005.0, math.inf, math.inf]
+    pd.testing.assert_series_equal(fused_equity, equity)
+    assert metrics["ending_equity"] == math.inf